@@ -0,0 +1,181 @@
+"""
+音频格式转换加速模块
+对流式识别热点路径上的 PCM 转换进行 JIT 编译，未安装 Numba 时回退到 NumPy 实现
+"""
+import numpy as np
+
+# 导入 Numba（可选依赖）
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _pcm16_to_f32_mono_kernel(pcm, channels, out):
+        """单次遍历完成类型转换、缩放和多声道下混"""
+        scale = np.float32(1.0 / (32768.0 * channels))
+        for i in range(out.shape[0]):
+            acc = np.float32(0.0)
+            base = i * channels
+            for c in range(channels):
+                acc += pcm[base + c]
+            out[i] = acc * scale
+
+    @njit(cache=True, fastmath=True)
+    def _f32_to_pcm16_kernel(src, dst):
+        """单次遍历完成多声道下混、缩放、饱和截断和 int16 转换，同时返回下混后的峰值"""
+        channels = src.shape[1]
+        scale = 32767.0 / channels
+        peak = 0.0
+        for i in range(src.shape[0]):
+            acc = 0.0
+            for c in range(channels):
+                acc += src[i, c]
+            a = abs(acc)
+            if a > peak:
+                peak = a
+            v = acc * scale
+            if v > 32767.0:
+                v = 32767.0
+            elif v < -32768.0:
+                v = -32768.0
+            dst[i] = np.int16(v)
+        return peak / channels
+
+    @njit(cache=True, fastmath=True)
+    def _peak_abs_kernel(x, limit):
+        """单次遍历计算绝对值峰值，峰值达到 limit 时提前返回"""
+        peak = 0.0
+        for i in range(x.shape[0]):
+            a = abs(x[i])
+            if a > peak:
+                peak = a
+                if peak >= limit:
+                    break
+        return peak
+
+
+def pcm16_bytes_to_f32_mono(buf: bytes, channels: int = 1) -> np.ndarray:
+    """
+    将16位交错PCM字节转换为单声道float32数组
+
+    Args:
+        buf: 16位交错PCM字节
+        channels: 声道数
+
+    Returns:
+        np.ndarray: 归一化到[-1, 1)的单声道float32数组
+    """
+    pcm = np.frombuffer(buf, dtype=np.int16)
+
+    if HAS_NUMBA:
+        out = np.empty(pcm.shape[0] // channels, dtype=np.float32)
+        _pcm16_to_f32_mono_kernel(pcm, channels, out)
+        return out
+
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels)
+        return pcm.sum(axis=1, dtype=np.float32) * np.float32(1.0 / (32768.0 * channels))
+    return np.multiply(pcm, np.float32(1.0 / 32768.0), dtype=np.float32)
+
+
+def ensure_mono_f32(audio_data) -> np.ndarray:
+    """
+    将任意输入规范化为 sherpa-onnx 需要的连续单声道 float32 数组
+
+    支持 16 位 PCM 字节、int16 数组、多声道数组以及已经符合要求的 float32 数组。
+
+    Args:
+        audio_data: 音频数据
+
+    Returns:
+        np.ndarray: C 连续的单声道 float32 数组
+    """
+    if isinstance(audio_data, (bytes, bytearray, memoryview)):
+        return pcm16_bytes_to_f32_mono(audio_data)
+
+    if audio_data.dtype == np.int16:
+        channels = audio_data.shape[1] if audio_data.ndim > 1 else 1
+        return pcm16_bytes_to_f32_mono(np.ascontiguousarray(audio_data), channels)
+
+    if audio_data.ndim > 1:
+        audio_data = audio_data.mean(axis=1)
+    return np.ascontiguousarray(audio_data, dtype=np.float32)
+
+
+def f32_to_pcm16(src: np.ndarray, dst: np.ndarray, scratch: np.ndarray = None) -> np.ndarray:
+    """
+    将 float32 音频（单声道或多声道）转换为单声道 16 位 PCM
+
+    Args:
+        src: 形状为 (n,) 或 (n, channels) 的 float32 数组
+        dst: 预分配的 int16 缓冲区，长度不小于 n
+        scratch: 预分配的 float32 中间缓冲区，长度不小于 n（仅 NumPy 实现使用）
+
+    Returns:
+        np.ndarray: dst 中写入了结果的前 n 个元素
+    """
+    return f32_to_pcm16_peak(src, dst, scratch)[0]
+
+
+def f32_to_pcm16_peak(src: np.ndarray, dst: np.ndarray, scratch: np.ndarray = None):
+    """
+    将 float32 音频转换为单声道 16 位 PCM，同时返回下混后的绝对值峰值（用于静音检测）
+
+    Args:
+        src: 形状为 (n,) 或 (n, channels) 的 float32 数组
+        dst: 预分配的 int16 缓冲区，长度不小于 n
+        scratch: 预分配的 float32 中间缓冲区，长度不小于 n（仅 NumPy 实现使用）
+
+    Returns:
+        tuple: (dst 中写入了结果的前 n 个元素, 归一化峰值)
+    """
+    if src.ndim == 1:
+        src = src.reshape(-1, 1)
+    n = src.shape[0]
+    out = dst[:n]
+
+    if HAS_NUMBA:
+        peak = _f32_to_pcm16_kernel(src, out)
+        return out, peak
+
+    # 在预分配缓冲区上原地完成下混、缩放和截断，不产生临时数组
+    mono = scratch[:n] if scratch is not None else np.empty(n, dtype=np.float32)
+    np.sum(src, axis=1, out=mono)
+    np.multiply(mono, 32767.0 / src.shape[1], out=mono)
+    peak = max(float(mono.max()), -float(mono.min())) / 32767.0 if n else 0.0
+    np.clip(mono, -32768, 32767, out=mono)
+    out[:] = mono
+    return out, peak
+
+
+def peak_abs(x: np.ndarray, limit: float = np.inf) -> float:
+    """
+    计算单声道音频的绝对值峰值，不产生临时数组
+
+    用于静音检测时传入阈值作为 limit：有声音的音频块在第一个超过阈值的样本处即可结束扫描。
+
+    Args:
+        x: 一维 float32 数组
+        limit: 峰值达到该值后提前返回（返回值不小于 limit，但不一定是真实峰值）
+
+    Returns:
+        float: 绝对值峰值
+    """
+    if HAS_NUMBA:
+        return _peak_abs_kernel(x, limit)
+    if not x.shape[0]:
+        return 0.0
+    return max(float(x.max()), -float(x.min()))
+
+
+def warmup() -> None:
+    """预先触发 JIT 编译，避免首个音频块承担编译延迟"""
+    if not HAS_NUMBA:
+        return
+    f32_to_pcm16(np.zeros((1, 2), dtype=np.float32), np.empty(1, dtype=np.int16))
+    peak_abs(np.zeros(1, dtype=np.float32))
+    pcm16_bytes_to_f32_mono(b"\x00\x00")
@@ -1,8 +1,51 @@
 import os
+import re
+import traceback
 import numpy as np
 from typing import Optional, Union, Dict, Any
 import sherpa_onnx
 
+from src.core.asr._audio_fast import ensure_mono_f32
+
+# 导入 Sherpa-ONNX 日志工具（模块加载时只导入一次）
+try:
+    from src.utils.sherpa_logger import sherpa_logger
+except ImportError:
+    # 如果导入失败，创建一个简单的日志记录器
+    class DummyLogger:
+        def debug(self, msg): print(f"DEBUG: {msg}")
+        def info(self, msg): print(f"INFO: {msg}")
+        def warning(self, msg): print(f"WARNING: {msg}")
+        def error(self, msg): print(f"ERROR: {msg}")
+    sherpa_logger = DummyLogger()
+
+# 预编译结果后处理用的正则表达式，避免每次获取结果时重复编译
+_CAMEL_SPLIT = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')  # 句子边界（小写/数字后紧跟大写）
+_TRAIL_WS = re.compile(r'\s+$')  # 末尾空白
+_NON_ASCII = re.compile(r'[^\x00-\x7F]+')  # 非英文字符
+
+
+def _mark_sentence_boundaries(text: str) -> str:
+    """
+    在小写字母或数字后紧跟大写字母的位置插入句号（句子边界）
+
+    识别结果通常是全大写或全小写的单词序列，不存在这样的位置；
+    先逐字符扫描，只有确实存在句子边界时才执行正则替换
+
+    Args:
+        text: 识别结果
+
+    Returns:
+        str: 插入句号后的文本
+    """
+    prev_lower = False
+    for c in text:
+        if prev_lower and 'A' <= c <= 'Z':
+            return _CAMEL_SPLIT.sub('. ', text)
+        prev_lower = 'a' <= c <= 'z' or '0' <= c <= '9'
+    return text
+
+
 class SherpaOnnxASR:
     """Sherpa-ONNX ASR 引擎实现"""
 
@@ -42,6 +85,8 @@ class SherpaOnnxASR:
         self.model_config = model_config
         self.recognizer = None
         self.stream = None
+        self.current_stream = None  # 兼容Vosk API的流式接口使用的流
+        self._has_audio = False  # 上次获取最终结果后是否接收过音频
         self.config = None
         self.sample_rate = 16000
         self.is_int8 = True  # 默认使用int8量化模型
@@ -211,6 +256,7 @@ class SherpaOnnxASR:
                 "sample_rate": self.model_config.get("sample_rate", 16000),
                 "feature_dim": 80,
                 "decoding_method": "greedy_search",
+                "provider": self.model_config.get("provider", "cpu"),
                 "debug": False,
                 # 添加端点检测参数，参考TMSpeech项目
                 "enable_endpoint": self.model_config.get("enable_endpoint", 1),
@@ -241,6 +287,12 @@ class SherpaOnnxASR:
             except ImportError:
                 sherpa_logger.warning("无法导入 config_manager，使用默认配置")
 
+            # 推理线程数不超过本机逻辑核数，避免 ONNX Runtime 线程超额订阅
+            cpu_count = os.cpu_count() or 1
+            if self.config["num_threads"] > cpu_count:
+                sherpa_logger.info(f"num_threads={self.config['num_threads']} 超过CPU核数，调整为 {cpu_count}")
+                self.config["num_threads"] = cpu_count
+
             # 使用 OnlineRecognizer 类的 from_transducer 静态方法创建实例
             # 这是 sherpa-onnx 版本的 API
             try:
@@ -302,6 +354,7 @@ class SherpaOnnxASR:
                     sherpa_logger.info(f"  sample_rate: {self.config.get('sample_rate', 16000)}")
                     sherpa_logger.info(f"  feature_dim: {self.config.get('feature_dim', 80)}")
                     sherpa_logger.info(f"  decoding_method: {self.config.get('decoding_method', 'greedy_search')}")
+                    sherpa_logger.info(f"  provider: {self.config.get('provider', 'cpu')}")
                     sherpa_logger.info(f"  enable_endpoint_detection: {bool(self.config.get('enable_endpoint', 1))}")
                     sherpa_logger.info(f"  rule1_min_trailing_silence: {float(self.config.get('rule1_min_trailing_silence', 3.0))}")
                     sherpa_logger.info(f"  rule2_min_trailing_silence: {float(self.config.get('rule2_min_trailing_silence', 1.5))}")
@@ -320,6 +373,7 @@ class SherpaOnnxASR:
                         sample_rate=self.config.get("sample_rate", 16000),
                         feature_dim=self.config.get("feature_dim", 80),
                         decoding_method=self.config.get("decoding_method", "greedy_search"),
+                        provider=self.config.get("provider", "cpu"),
                         # 添加端点检测参数
                         enable_endpoint_detection=bool(self.config.get("enable_endpoint", 1)),
                         rule1_min_trailing_silence=float(self.config.get("rule1_min_trailing_silence", 3.0)),
@@ -332,12 +386,14 @@ class SherpaOnnxASR:
                     self.engine_type = "sherpa_int8" if self.is_int8 else "sherpa_std"
                     sherpa_logger.info(f"设置引擎类型: {self.engine_type}")
 
+                    # 预分配 200ms 尾部填充静音，accept_waveform 只读不写，可重复使用
+                    self._tail_paddings = np.zeros(int(0.2 * self.sample_rate), dtype=np.float32)
+
                     # 测试创建流
                     try:
-                        test_stream = self.recognizer.create_stream()
+                        # 保留测试流，供首次转录直接使用
+                        self.stream = self.recognizer.create_stream()
                         sherpa_logger.info("测试创建流成功")
-                        # 不需要保存测试流
-                        del test_stream
                     except Exception as stream_error:
                         sherpa_logger.warning(f"测试创建流失败: {stream_error}")
                         # 这不是致命错误，继续执行
@@ -347,7 +403,6 @@ class SherpaOnnxASR:
                     sherpa_logger.error(error_msg)
 
                     # 记录更详细的错误信息
-                    import traceback
                     error_trace = traceback.format_exc()
                     sherpa_logger.error(f"详细错误信息:\n{error_trace}")
 
@@ -367,7 +422,6 @@ class SherpaOnnxASR:
                 error_msg = f"创建 OnlineRecognizer 实例失败: {e}"
                 sherpa_logger.error(error_msg)
                 # 打印详细的异常堆栈信息
-                import traceback
                 sherpa_logger.error(traceback.format_exc())
                 raise RuntimeError(error_msg)
 
@@ -381,12 +435,27 @@ class SherpaOnnxASR:
             error_msg = f"Sherpa-ONNX ASR 初始化失败: {e}"
             sherpa_logger.error(error_msg)
             print(error_msg)
-            import traceback
             error_trace = traceback.format_exc()
             sherpa_logger.error(error_trace)
             print(error_trace)
             return False
 
+    def _take_stream(self):
+        """
+        取出一个未使用过的流
+
+        调用 input_finished() 后的流不能再接受音频，也无法通过 reset 复用，
+        因此这里只复用 setup() 中预先创建的流，用完即弃，之后按需新建。
+
+        Returns:
+            OnlineStream: 可用的流
+        """
+        stream = self.stream
+        if stream is None:
+            return self.recognizer.create_stream()
+        self.stream = None
+        return stream
+
     def transcribe(self, audio_data: Union[bytes, np.ndarray]) -> Optional[str]:
         """
         转录音频数据
@@ -401,52 +470,30 @@ class SherpaOnnxASR:
             if not self.recognizer:
                 return None
 
-            # 每次转录都创建一个新的流，避免状态累积导致的问题
+            # 每次转录都使用一个新的流，避免状态累积导致的问题
             try:
-                stream = self.recognizer.create_stream()
+                stream = self._take_stream()
             except Exception as e:
                 print(f"创建流错误: {e}")
                 return None
 
-            # 确保音频数据是numpy数组
-            if isinstance(audio_data, bytes):
-                # 将字节转换为16位整数数组
-                import array
-                audio_array = array.array('h', audio_data)
-                audio_data = np.array(audio_array, dtype=np.float32) / 32768.0
-
-            # 确保音频数据是单声道
-            if len(audio_data.shape) > 1:
-                audio_data = np.mean(audio_data, axis=1)
+            # 确保音频数据是连续的单声道float32数组
+            audio_data = ensure_mono_f32(audio_data)
 
             # 处理音频数据
             try:
-                # 导入 Sherpa-ONNX 日志工具
-                try:
-                    from src.utils.sherpa_logger import sherpa_logger
-                except ImportError:
-                    # 如果导入失败，创建一个简单的日志记录器
-                    class DummyLogger:
-                        def debug(self, msg): print(f"DEBUG: {msg}")
-                        def info(self, msg): print(f"INFO: {msg}")
-                        def warning(self, msg): print(f"WARNING: {msg}")
-                        def error(self, msg): print(f"ERROR: {msg}")
-                    sherpa_logger = DummyLogger()
-
                 # 记录音频数据信息
                 sherpa_logger.debug(f"音频数据类型: {type(audio_data)}, 形状: {audio_data.shape if hasattr(audio_data, 'shape') else '未知'}")
                 sherpa_logger.debug(f"音频数据最大值: {np.max(np.abs(audio_data)) if hasattr(audio_data, 'shape') else '未知'}")
 
                 # 直接处理整个音频数据（完全按照官方测试文件的方法）
-                sherpa_logger.debug("接受音频数据...")
-                stream.accept_waveform(self.sample_rate, audio_data)
-                sherpa_logger.debug("音频数据接受成功")
-
-                # 添加尾部填充（这是关键步骤，来自官方测试文件）
-                sherpa_logger.debug("添加尾部填充...")
-                tail_paddings = np.zeros(int(0.2 * self.sample_rate), dtype=np.float32)
-                stream.accept_waveform(self.sample_rate, tail_paddings)
-                sherpa_logger.debug("尾部填充添加成功")
+                # 尾部填充是关键步骤（来自官方测试文件），与音频拼接后一次性送入，
+                # 减少一次 Python 到 C++ 的调用和特征提取调度
+                sherpa_logger.debug("接受音频数据并添加尾部填充...")
+                stream.accept_waveform(self.sample_rate, np.concatenate([audio_data, self._tail_paddings]))
+                if len(audio_data):
+                    self._has_audio = True
+                sherpa_logger.debug("音频数据及尾部填充接受成功")
 
                 # 标记输入结束
                 sherpa_logger.debug("标记输入结束...")
@@ -465,39 +512,20 @@ class SherpaOnnxASR:
             except Exception as e:
                 error_msg = f"处理音频数据错误: {e}"
                 print(error_msg)
-                try:
-                    from src.utils.sherpa_logger import sherpa_logger
-                    sherpa_logger.error(error_msg)
-                    import traceback
-                    error_trace = traceback.format_exc()
-                    sherpa_logger.error(error_trace)
-                    print(error_trace)
-                except ImportError:
-                    import traceback
-                    traceback.print_exc()
+                sherpa_logger.error(error_msg)
+                error_trace = traceback.format_exc()
+                sherpa_logger.error(error_trace)
+                print(error_trace)
                 return None
 
             # 获取结果
             try:
-                # 导入 Sherpa-ONNX 日志工具
-                try:
-                    from src.utils.sherpa_logger import sherpa_logger
-                except ImportError:
-                    # 如果导入失败，创建一个简单的日志记录器
-                    class DummyLogger:
-                        def debug(self, msg): print(f"DEBUG: {msg}")
-                        def info(self, msg): print(f"INFO: {msg}")
-                        def warning(self, msg): print(f"WARNING: {msg}")
-                        def error(self, msg): print(f"ERROR: {msg}")
-                    sherpa_logger = DummyLogger()
-
                 # 使用 get_result 获取结果
                 result = self.recognizer.get_result(stream)
                 if result:
                     # 使用正则表达式处理结果，确保每个句子以句号结尾
-                    import re
-                    result = re.sub(r'(?<=[a-zA-Z0-9])(?=[A-Z])', '. ', result)
-                    result = re.sub(r'\s+$', '', result)  # 去除末尾空格
+                    result = _mark_sentence_boundaries(result)
+                    result = _TRAIL_WS.sub('', result)  # 去除末尾空格
                     if not result.endswith('.'):
                         result += '.'  # 确保结果以句号结尾
                     print(f"转录结果: {result}")
@@ -509,21 +537,14 @@ class SherpaOnnxASR:
             except Exception as e:
                 error_msg = f"获取结果错误: {e}"
                 print(error_msg)
-                try:
-                    from src.utils.sherpa_logger import sherpa_logger
-                    sherpa_logger.error(error_msg)
-                    import traceback
-                    error_trace = traceback.format_exc()
-                    sherpa_logger.error(error_trace)
-                    print(error_trace)
-                except ImportError:
-                    import traceback
-                    traceback.print_exc()
+                sherpa_logger.error(error_msg)
+                error_trace = traceback.format_exc()
+                sherpa_logger.error(error_trace)
+                print(error_trace)
                 return None
 
         except Exception as e:
             print(f"Sherpa-ONNX 转录错误: {e}")
-            import traceback
             print(traceback.format_exc())
             return None
 
@@ -543,9 +564,14 @@ class SherpaOnnxASR:
             if not self.recognizer:
                 return None
 
+            # 自上次获取最终结果以来没有接收过音频，无需创建流和解码
+            if not self._has_audio:
+                return None
+            self._has_audio = False
+
             # 创建一个新的流
             try:
-                stream = self.recognizer.create_stream()
+                stream = self._take_stream()
             except Exception as e:
                 print(f"创建流错误: {e}")
                 return None
@@ -585,7 +611,6 @@ class SherpaOnnxASR:
 
         except Exception as e:
             print(f"获取 Sherpa-ONNX 最终结果错误: {e}")
-            import traceback
             print(traceback.format_exc())
             return None
 
@@ -599,18 +624,6 @@ class SherpaOnnxASR:
         Returns:
             str: 转录文本，如果失败则返回None
         """
-        # 导入 Sherpa-ONNX 日志工具
-        try:
-            from src.utils.sherpa_logger import sherpa_logger
-        except ImportError:
-            # 如果导入失败，创建一个简单的日志记录器
-            class DummyLogger:
-                def debug(self, msg): print(f"DEBUG: {msg}")
-                def info(self, msg): print(f"INFO: {msg}")
-                def warning(self, msg): print(f"WARNING: {msg}")
-                def error(self, msg): print(f"ERROR: {msg}")
-            sherpa_logger = DummyLogger()
-
         try:
             sherpa_logger.info(f"开始转录文件: {file_path}")
 
@@ -690,7 +703,6 @@ class SherpaOnnxASR:
                 error_msg = f"读取 WAV 文件失败: {e}"
                 sherpa_logger.error(error_msg)
                 print(error_msg)
-                import traceback
                 sherpa_logger.error(traceback.format_exc())
                 return None
 
@@ -711,7 +723,6 @@ class SherpaOnnxASR:
                 error_msg = f"创建流失败: {e}"
                 sherpa_logger.error(error_msg)
                 print(error_msg)
-                import traceback
                 sherpa_logger.error(traceback.format_exc())
                 return None
 
@@ -806,9 +817,8 @@ class SherpaOnnxASR:
             # 过滤掉非英文字符
             if result:
                 try:
-                    import re
                     # 只保留英文字母、数字、标点符号和空格
-                    filtered_result = re.sub(r'[^\x00-\x7F]+', '', result)
+                    filtered_result = _NON_ASCII.sub('', result)
                     sherpa_logger.info(f"过滤后的最终结果: {filtered_result}")
                     return filtered_result
                 except Exception as e:
@@ -827,7 +837,6 @@ class SherpaOnnxASR:
             except:
                 pass
             print(error_msg)
-            import traceback
             error_trace = traceback.format_exc()
             try:
                 sherpa_logger.error(error_trace)
@@ -847,24 +856,13 @@ class SherpaOnnxASR:
             bool: 是否有完整的识别结果
         """
         try:
-            # 获取日志记录器
-            try:
-                from src.utils.sherpa_logger import sherpa_logger
-            except ImportError:
-                class DummyLogger:
-                    def debug(self, msg): print(f"DEBUG: {msg}")
-                    def info(self, msg): print(f"INFO: {msg}")
-                    def warning(self, msg): print(f"WARNING: {msg}")
-                    def error(self, msg): print(f"ERROR: {msg}")
-                sherpa_logger = DummyLogger()
-
             # 检查识别器是否已初始化
             if not self.recognizer:
                 sherpa_logger.error("识别器未初始化")
                 return False
 
             # 创建新的流
-            if not hasattr(self, 'current_stream') or self.current_stream is None:
+            if self.current_stream is None:
                 try:
                     self.current_stream = self.recognizer.create_stream()
                     sherpa_logger.debug("创建新的流")
@@ -872,26 +870,17 @@ class SherpaOnnxASR:
                     sherpa_logger.error(f"创建流错误: {e}")
                     return False
 
-            # 确保音频数据是numpy数组
-            if isinstance(audio_data, bytes):
-                # 将字节转换为16位整数数组
-                import array
-                audio_array = array.array('h', audio_data)
-                audio_data = np.array(audio_array, dtype=np.float32) / 32768.0
-                sherpa_logger.debug(f"将字节数据转换为numpy数组，长度: {len(audio_data)}")
-
-            # 确保音频数据是单声道
-            if len(audio_data.shape) > 1:
-                audio_data = np.mean(audio_data, axis=1)
-                sherpa_logger.debug(f"将多声道数据转换为单声道，形状: {audio_data.shape}")
+            # 确保音频数据是连续的单声道float32数组
+            audio_data = ensure_mono_f32(audio_data)
 
             # 处理音频数据
             try:
                 self.current_stream.accept_waveform(self.sample_rate, audio_data)
+                if len(audio_data):
+                    self._has_audio = True
                 sherpa_logger.debug(f"接受音频数据，长度: {len(audio_data)}")
             except Exception as e:
                 sherpa_logger.error(f"接受音频数据错误: {e}")
-                import traceback
                 sherpa_logger.error(traceback.format_exc())
                 return False
 
@@ -910,13 +899,11 @@ class SherpaOnnxASR:
                 return has_result
             except Exception as e:
                 sherpa_logger.error(f"检查结果错误: {e}")
-                import traceback
                 sherpa_logger.error(traceback.format_exc())
                 return False
 
         except Exception as e:
             print(f"AcceptWaveform 错误: {e}")
-            import traceback
             print(traceback.format_exc())
             return False
 
@@ -929,35 +916,48 @@ class SherpaOnnxASR:
         """
         try:
             # 检查识别器和流是否已初始化
-            if not self.recognizer or not hasattr(self, 'current_stream') or self.current_stream is None:
+            if not self.recognizer or self.current_stream is None:
                 return ""
 
-            # 解码
-            while self.recognizer.is_ready(self.current_stream):
-                self.recognizer.decode_stream(self.current_stream)
-
+            # AcceptWaveform 已将就绪的帧全部解码，这里无需再轮询 is_ready
             # 获取结果
             result = self.recognizer.get_result(self.current_stream)
 
-            # 重置流
-            self.current_stream = self.recognizer.create_stream()
+            # 仅在确实消费了文本或检测到端点时重置流；
+            # 空结果的轮询无需重建流（避免重复分配编码器缓存）
+            if result or self.recognizer.is_endpoint(self.current_stream):
+                self.reset_stream()
 
             # 处理结果
             if result:
                 # 使用正则表达式处理结果，确保每个句子以句号结尾
-                import re
-                result = re.sub(r'(?<=[a-zA-Z0-9])(?=[A-Z])', '. ', result)
-                result = re.sub(r'\s+$', '', result)  # 去除末尾空格
+                result = _mark_sentence_boundaries(result)
+                result = _TRAIL_WS.sub('', result)  # 去除末尾空格
                 if not result.endswith('.'):
                     result += '.'  # 确保结果以句号结尾
 
             return result if result else ""
         except Exception as e:
             print(f"Result 错误: {e}")
-            import traceback
             print(traceback.format_exc())
             return ""
 
+    def reset_stream(self) -> None:
+        """
+        重置当前流（兼容Vosk API的流式接口）
+
+        优先使用识别器的 reset 方法复用现有流对象，不支持时再创建新流。
+        流中已接收的音频随之丢弃，同时清除"已接收音频"标记。
+        """
+        if not self.recognizer:
+            return
+
+        if self.current_stream is not None and hasattr(self.recognizer, 'reset'):
+            self.recognizer.reset(self.current_stream)
+        else:
+            self.current_stream = self.recognizer.create_stream()
+        self._has_audio = False
+
     def PartialResult(self) -> str:
         """
         获取部分识别结果（兼容Vosk API）
@@ -967,20 +967,16 @@ class SherpaOnnxASR:
         """
         try:
             # 检查识别器和流是否已初始化
-            if not self.recognizer or not hasattr(self, 'current_stream') or self.current_stream is None:
+            if not self.recognizer or self.current_stream is None:
                 return ""
 
-            # 解码
-            while self.recognizer.is_ready(self.current_stream):
-                self.recognizer.decode_stream(self.current_stream)
-
+            # AcceptWaveform 已将就绪的帧全部解码，这里无需再轮询 is_ready
             # 获取部分结果
             result = self.recognizer.get_result(self.current_stream)
 
             return result if result else ""
         except Exception as e:
             print(f"PartialResult 错误: {e}")
-            import traceback
             print(traceback.format_exc())
             return ""
 
@@ -998,16 +994,6 @@ class SherpaOnnxASR:
         Args:
             text: 识别到的句子文本
         """
-        try:
-            from src.utils.sherpa_logger import sherpa_logger
-        except ImportError:
-            class DummyLogger:
-                def debug(self, msg): print(f"DEBUG: {msg}")
-                def info(self, msg): print(f"INFO: {msg}")
-                def warning(self, msg): print(f"WARNING: {msg}")
-                def error(self, msg): print(f"ERROR: {msg}")
-            sherpa_logger = DummyLogger()
-
         sherpa_logger.info(f"句子结束: {text}")
         # 这里可以添加更多的处理逻辑，例如将结果发送到UI或其他模块
         print(f"句子结束: {text}")
@@ -1,24 +1,60 @@
 import os
+import re
 import json
 import numpy as np
 from typing import Optional, Union
 from vosk import Model, KaldiRecognizer
 
+from src.core.asr import _audio_fast
+
+# 优先使用 orjson 解析识别结果（可选依赖），未安装时回退到标准库 json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 匹配结果 JSON 中顶层 text 字段（逐词结果中只有 word 字段，不会误匹配）
+_TEXT_RE = re.compile(r'"text"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _extract_text(raw: str) -> str:
+    """只提取 Vosk 结果中的 text 字段，避免为逐词时间戳构造大量字典
+
+    Args:
+        raw: Vosk 返回的 JSON 字符串
+
+    Returns:
+        str: text 字段内容，不存在时返回空字符串
+    """
+    match = _TEXT_RE.search(raw)
+    if match is None:
+        return ""
+    text = match.group(1)
+    if '\\' in text:
+        # 含转义字符时交给 JSON 解析器还原
+        text = _json_loads(f'"{text}"')
+    return text
+
 
 class VoskASR:
     """VOSK ASR 引擎封装类"""
 
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, want_words: bool = False):
         """初始化 VOSK ASR 引擎
 
         Args:
             model_path: VOSK 模型路径
+            want_words: 是否输出逐词置信度和时间戳（只使用 text 时无需开启）
         """
         # 直接使用传入的模型路径，不再从config_manager获取
         self.model_path = model_path
+        self._want_words = want_words
         self.model = None
         self.recognizer = None
         self.sample_rate = 16000
+        self._i16_scratch = None  # 浮点转 int16 的复用缓冲区
+        self._f32_scratch = None  # 转换时使用的浮点中间缓冲区
 
         # 设置引擎类型为vosk_small
         self.engine_type = "vosk_small"
@@ -39,7 +75,7 @@ class VoskASR:
 
             self.model = Model(self.model_path)
             self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
-            self.recognizer.SetWords(True)
+            self.recognizer.SetWords(self._want_words)
             return True
 
         except Exception as e:
@@ -61,10 +97,15 @@ class VoskASR:
         try:
             # 确保音频数据是字节类型
             if isinstance(audio_data, np.ndarray):
-                audio_data = (audio_data * 32767).astype(np.int16).tobytes()
+                # 缩放并饱和截断后写入复用的 int16 缓冲区，超出 [-1, 1] 的样本不会回绕
+                n = audio_data.shape[0]
+                if self._i16_scratch is None or self._i16_scratch.shape[0] < n:
+                    self._i16_scratch = np.empty(n, dtype=np.int16)
+                    self._f32_scratch = np.empty(n, dtype=np.float32)
+                audio_data = _audio_fast.f32_to_pcm16(audio_data, self._i16_scratch, self._f32_scratch).tobytes()
 
             if self.recognizer.AcceptWaveform(audio_data):
-                result = json.loads(self.recognizer.Result())
+                result = _json_loads(self.recognizer.Result())
                 return result.get("text", "")
             return None
 
@@ -89,7 +130,7 @@ class VoskASR:
                 return None
 
             recognizer = KaldiRecognizer(self.model, self.sample_rate)
-            recognizer.SetWords(True)
+            recognizer.SetWords(self._want_words)
 
             # 设置引擎类型
             recognizer.engine_type = "vosk_small"
@@ -114,8 +155,7 @@ class VoskASR:
                 print(f"Vosk原始最终结果: {final_result}")
 
                 # 解析JSON
-                result = json.loads(final_result)
-                text = result.get("text", "").strip()
+                text = _extract_text(final_result).strip()
                 print(f"Vosk解析后的最终结果: {text}")
 
                 # 格式化文本
@@ -171,7 +211,7 @@ class VoskASR:
 
                 # 创建新的识别器
                 recognizer = KaldiRecognizer(self.model, self.sample_rate)
-                recognizer.SetWords(True)
+                recognizer.SetWords(self._want_words)
 
                 # 设置引擎类型
                 recognizer.engine_type = "vosk_small"
@@ -180,34 +220,21 @@ class VoskASR:
                 results = []
                 chunk_size = 4000  # 每次读取的帧数
 
-                # 读取整个文件的所有帧
-                all_frames = []
+                # 逐块读取并处理音频，内存占用只与块大小相关
                 while True:
                     frames = wf.readframes(chunk_size)
                     if not frames:
                         break
-                    all_frames.append(frames)
-
-                # 重置文件指针
-                wf.rewind()
-
-                # 先处理前几个块，确保开头部分被正确识别
-                for i in range(min(5, len(all_frames))):
-                    recognizer.AcceptWaveform(all_frames[i])
-
-                # 处理所有音频块
-                for frames in all_frames:
                     if recognizer.AcceptWaveform(frames):
-                        result = json.loads(recognizer.Result())
-                        if result.get("text", "").strip():
-                            results.append(result.get("text", ""))
+                        text = _extract_text(recognizer.Result())
+                        if text.strip():
+                            results.append(text)
 
                 # 获取最终结果
                 final_result_str = recognizer.FinalResult()
                 print(f"文件转录最终结果原始字符串: {final_result_str}")
 
-                final_result = json.loads(final_result_str)
-                final_text = final_result.get("text", "").strip()
+                final_text = _extract_text(final_result_str).strip()
                 print(f"文件转录最终结果解析后: {final_text}")
 
                 if final_text:
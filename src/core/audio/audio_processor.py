@@ -2,19 +2,129 @@
 音频处理模块
 负责音频捕获和处理
 """
+import os
+import sys
 import time
+import functools
+import gc
 import json
+import logging
+import threading
 import numpy as np
 import soundcard as sc
 from typing import List, Any
-from PyQt5.QtCore import QObject, pyqtSignal, QThread
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, pyqtSlot, QThread
 
 from src.core.signals import TranscriptionSignals
+from src.core.asr import _audio_fast
+from src.core.audio.ring_buffer import AudioRingBuffer
+
+# 导入日志工具（模块加载时只导入一次）
+try:
+    from src.utils.sherpa_logger import sherpa_logger
+except ImportError:
+    # 如果导入失败，创建一个简单的日志记录器
+    class DummyLogger:
+        def debug(self, msg): print(f"DEBUG: {msg}")
+        def info(self, msg): print(f"INFO: {msg}")
+        def warning(self, msg): print(f"WARNING: {msg}")
+        def error(self, msg): print(f"ERROR: {msg}")
+        def isEnabledFor(self, level): return True
+    sherpa_logger = DummyLogger()
+
+# 优先使用 orjson 解析识别结果（可选依赖），未安装时回退到标准库 json
+# （解析方法以默认参数绑定该函数，按局部变量访问）
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.JSONDecoder().decode
+
+# Vosk 在没有新内容时返回的空部分结果，命中时无需解析 JSON
+_EMPTY_VOSK_PARTIAL = '{\n  "partial" : ""\n}'
+# Vosk 在静音后判定句子结束、但没有识别出内容时返回的空完整结果
+_EMPTY_VOSK_RESULT = '{\n  "text" : ""\n}'
+
+# 返回 JSON 字符串结果的 Vosk 引擎类型
+_VOSK_ENGINES = frozenset(('vosk_small', 'vosk'))
+
+# 句末标点，格式化完整句子时用于判断是否需要补句号
+_SENT_END = frozenset('.?!')
+
+
+def _capitalize_first(text: str) -> str:
+    """
+    将识别文本首字母大写（部分结果只做这一步，不补句末标点）
+
+    首字母不是小写时原样返回，不构造新字符串
+
+    Args:
+        text: 识别文本，可以为空
+
+    Returns:
+        str: 首字母大写后的文本
+    """
+    # 常见的 ASCII 首字符直接比较范围，非 ASCII 字符才回退到 str.islower
+    c = text[:1]
+    if 'a' <= c <= 'z' or (c > '\x7f' and c.islower()):
+        return c.upper() + text[1:]
+    return text
+
+
+@functools.lru_cache(maxsize=256)
+def _format_sentence(text: str) -> str:
+    """
+    将识别文本格式化为完整句子：首字母大写，缺少句末标点时补句号
+
+    只在确实需要修改时才构造新字符串，常见的已格式化文本原样返回；
+    流式识别中短句重复出现较多，结果会被缓存
+
+    Args:
+        text: 非空识别文本
+
+    Returns:
+        str: 格式化后的文本
+    """
+    text = _capitalize_first(text)
+    if text[-1] not in _SENT_END:
+        text += '.'
+    return text
+
+
+def _raise_thread_priority() -> bool:
+    """
+    提升当前线程的调度优先级（尽力而为，失败时保持默认优先级）
+
+    Returns:
+        bool: 是否提升成功
+    """
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            # 注册到多媒体类调度服务（MMCSS）的 Pro Audio 任务，与专业音频软件获得同等的调度保障；
+            # 线程退出时系统自动撤销注册
+            try:
+                task_index = ctypes.c_ulong(0)
+                ctypes.windll.avrt.AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task_index))
+            except OSError:
+                pass
+            # THREAD_PRIORITY_TIME_CRITICAL
+            return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 15))
+        if hasattr(os, 'sched_setscheduler'):
+            # 0 表示当前线程；没有实时调度权限时会抛出 PermissionError
+            param = os.sched_param(os.sched_get_priority_min(os.SCHED_FIFO))
+            os.sched_setscheduler(0, os.SCHED_FIFO, param)
+            return True
+    except (OSError, AttributeError):
+        pass
+    return False
+
 
 class AudioDevice:
     """音频设备类"""
 
-    def __init__(self, id, name, is_input=True):
+    def __init__(self, id, name, is_input=True, is_loopback=False):
         """
         初始化音频设备
 
@@ -22,19 +132,29 @@ class AudioDevice:
             id: 设备ID
             name: 设备名称
             is_input: 是否为输入设备
+            is_loopback: 是否为回环录音设备
         """
         self.id = id
         self.name = name
         self.is_input = is_input
+        self.is_loopback = is_loopback
+
+    @property
+    def needs_loopback(self) -> bool:
+        """打开该设备录音时是否需要回环模式（扬声器和回环设备需要，真实麦克风不需要）"""
+        return self.is_loopback or not self.is_input
 
     def __str__(self):
         return f"{self.name} ({self.id})"
 
+
 class AudioWorker(QObject):
     """音频处理工作线程"""
     finished = pyqtSignal()
     error = pyqtSignal(str)
     new_text = pyqtSignal(str)
+    partial_text = pyqtSignal(str)  # 部分识别结果（不带PARTIAL:标记）
+    final_result = pyqtSignal(str, str)  # 处理结束时的最终结果和最后一个部分结果（由界面线程补全后发送）
     status = pyqtSignal(str)
     progress = pyqtSignal(int, str)
 
@@ -45,15 +165,42 @@ class AudioWorker(QObject):
         self.buffer_size = buffer_size
         self.recognizer = recognizer
         self.running = True
+        # 识别器在整个处理过程中不会更换，引擎类型只需解析一次
+        self.engine_type = getattr(recognizer, 'engine_type', None)
+        self._is_vosk = self.engine_type in _VOSK_ENGINES
+        self._is_sherpa = bool(self.engine_type) and self.engine_type.startswith('sherpa')
+        # 结果解析方法按引擎类型绑定一次，识别循环中不再逐块判断引擎类型
+        if self._is_vosk:
+            self._parse_result = self._parse_vosk_result
+            self._parse_partial_result = self._parse_vosk_partial
+        else:
+            self._parse_result = self._parse_generic_result
+            self._parse_partial_result = self._parse_generic_partial
         self._last_partial_result = ""  # 保存最后一个部分结果
+        self._pcm_bytes = bytearray(2 * buffer_size)  # Vosk 输入的 PCM 字节复用缓冲区
+        self._pcm_buf = np.frombuffer(self._pcm_bytes, dtype=np.int16)  # 同一块内存的 int16 视图，转换结果直接写入字节缓冲区
+        self._mono_buf = np.empty(buffer_size, dtype=np.float32)  # PCM 转换的浮点中间缓冲区
+        self._downmix_buf = np.empty(buffer_size, dtype=np.float32)  # 多声道下混结果的复用缓冲区
+        self._downmix_weights = None  # 下混权重向量（每个声道 1/channels），按声道数缓存
+        self._pcm_input = None  # 识别器接受的 PCM 输入类型：memoryview/bytearray/bytes（首次送入音频时探测）
+        chunk_seconds = buffer_size / sample_rate  # 每个音频块的时长（秒）
+        self.ring_slots = max(8, int(2.0 / chunk_seconds))  # 采集线程与识别线程之间的环形缓冲区槽位数（至少缓冲约2秒音频）
+        self.cpu_affinity = None  # 识别线程绑定的 CPU 核心集合（仅 Linux 有效），None 表示不绑定
+        self._progress_every = max(1, int(0.5 / chunk_seconds))  # 每隔多少个音频块更新一次进度（约0.5秒）
+        self.coalesce_samples = 0  # 合并到该样本数后再送入识别器，0 表示不合并（增大可降低CPU占用，但会增加延迟）
+        self._accum = None  # 合并缓冲区
+        self._accum_fill = 0  # 合并缓冲区中已有的样本数
+        self._capture_error = None  # 采集线程中发生的异常
 
         # 静音检测相关参数
         self.silence_threshold = 0.01  # 静音阈值
         self.silence_frames = 0  # 连续静音帧计数
-        self.silence_frames_threshold = 15  # 静音帧阈值（约1.5秒，取决于buffer_size和采样率）
-        self.last_sentence_end_time = time.time()  # 上次句子结束时间
+        self.silence_frames_threshold = max(1, round(1.5 / chunk_seconds))  # 静音帧阈值（约1.5秒）
+        self._silence_grace = max(1, round(0.1 / chunk_seconds))  # 连续静音时仍送入识别器的帧数（约0.1秒），之后的静音帧不再解码
+        self.last_sentence_end_time = time.monotonic()  # 上次句子结束时间（单调时钟）
         self.current_partial_text = ""  # 当前累积的部分文本
         self.sentence_in_progress = False  # 是否有句子正在进行中
+        self._debug = sherpa_logger.isEnabledFor(logging.DEBUG)  # 是否输出调试日志，关闭时跳过调试消息的格式化
 
         # 尝试初始化COM（在主线程中）
         try:
@@ -70,20 +217,20 @@ class AudioWorker(QObject):
 
     def process(self):
         """处理音频数据"""
-        start_time = time.time()
-        last_progress_update = time.time()
-
-        # 导入日志工具
-        try:
-            from src.utils.sherpa_logger import sherpa_logger
-        except ImportError:
-            # 如果导入失败，创建一个简单的日志记录器
-            class DummyLogger:
-                def debug(self, msg): print(f"DEBUG: {msg}")
-                def info(self, msg): print(f"INFO: {msg}")
-                def warning(self, msg): print(f"WARNING: {msg}")
-                def error(self, msg): print(f"ERROR: {msg}")
-            sherpa_logger = DummyLogger()
+        chunk_count = 0
+        start_time = time.monotonic()
+        last_elapsed = -1  # 上次发送进度时的转录秒数
+        pending_partial = None  # 尚未发送的最新部分结果
+        last_partial = None  # 上次发送的部分结果（与之相同的部分结果不再重复发送）
+        ring = None
+        gc_was_enabled = gc.isenabled()  # 进入时垃圾回收是否开启（关闭时解码期间不再切换）
+
+        # 按配置将识别线程绑定到指定核心（尽力而为）
+        if self.cpu_affinity and hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(0, self.cpu_affinity)
+            except OSError as e:
+                sherpa_logger.warning(f"设置识别线程CPU亲和性失败: {e}")
 
         try:
             # 确保COM已初始化
@@ -102,156 +249,201 @@ class AudioWorker(QObject):
                 # 即使COM初始化失败，也尝试继续执行
 
             # 记录引擎类型
-            engine_type = getattr(self.recognizer, 'engine_type', None)
-            sherpa_logger.info(f"开始音频处理，引擎类型: {engine_type}")
+            sherpa_logger.info(f"开始音频处理，引擎类型: {self.engine_type}")
+
+            # 采集线程只负责从设备读取音频，当前线程负责识别；
+            # 识别器偶尔卡顿时音频暂存在环形缓冲区中，不会丢失
+            ring = AudioRingBuffer(self.ring_slots)
+            self._capture_error = None
+            capture_thread = threading.Thread(target=self._capture_loop, args=(ring,), daemon=True)
+            capture_thread.start()
+
+            # 热点循环中反复调用的方法和不变的属性提前绑定为局部变量，省去每个音频块的属性查找
+            is_sherpa = self._is_sherpa
+            prepare = self._prepare_f32 if is_sherpa else self._prepare_pcm16
+            if not is_sherpa:
+                accept = self._accept_pcm16
+            elif self.coalesce_samples > 0:
+                accept = self._accept_f32
+            else:
+                accept = self.recognizer.AcceptWaveform
+            get_result = self.recognizer.Result
+            get_partial = self.recognizer.PartialResult
+            parse_result = self._parse_result
+            parse_partial = self._parse_partial_result
+            emit_text = self.new_text.emit
+            emit_partial = self.partial_text.emit
+            emit_progress = self.progress.emit
+            progress_every = self._progress_every
+            silence_threshold = self.silence_threshold
+            silence_grace = self._silence_grace
+            # 调试日志在热点循环中按音频块输出，日志级别不含 DEBUG 时连消息字符串都不构造
+            debug = self._debug = sherpa_logger.isEnabledFor(logging.DEBUG)
+
+            # 异常处理放在内层循环之外：热点循环体内不设异常处理，
+            # 单个音频块处理失败时记录错误后重新进入循环，不终止处理
+            while self.running and not ring.closed:
+                try:
+                    while self.running:
+                        # 从环形缓冲区取出音频数据
+                        data = ring.get(timeout=0.5)
+                        if data is None:
+                            if ring.closed:
+                                break
+                            continue
 
-            with sc.get_microphone(id=str(self.device.id), include_loopback=True).recorder(
-                samplerate=self.sample_rate
-            ) as mic:
-                self.status.emit(f"正在从 {self.device.name} 捕获音频...")
-                sherpa_logger.info(f"正在从 {self.device.name} 捕获音频...")
+                        # 更新进度：音频块按固定节奏到达，按块计数节流，只在需要更新时读取一次时钟；
+                        # 时长取自单调时钟，采集线程丢弃音频块时也不会少算
+                        chunk_count += 1
+                        if chunk_count % progress_every == 0:
+                            # 显示精度为秒，同一秒内不重复格式化和发送
+                            elapsed = int(time.monotonic() - start_time)
+                            if elapsed != last_elapsed:
+                                last_elapsed = elapsed
+                                minutes, seconds = divmod(elapsed, 60)
+                                emit_progress(50, f"转录时长: {minutes:02d}:{seconds:02d}")
+
+                            # 部分结果只需要最新的一条，随进度一起发送，减少跨线程信号数量
+                            if pending_partial is not None:
+                                if pending_partial != last_partial:
+                                    emit_partial(pending_partial)
+                                    last_partial = pending_partial
+                                pending_partial = None
+
+                        # 记录音频数据信息
+                        if debug:
+                            sherpa_logger.debug(f"捕获音频数据，形状: {data.shape}")
+
+                        # 转换为单声道并检查音频数据是否有效
+                        # （Vosk 路径在同一次遍历中完成下混、峰值计算和 PCM 转换，不经过浮点单声道缓冲区）
+                        payload, max_amplitude = prepare(data)
+
+                        # 静音检测
+                        if max_amplitude < silence_threshold:
+                            if debug:
+                                sherpa_logger.debug(f"检测到静音，最大振幅: {max_amplitude}，静音帧计数: {self.silence_frames}")
+                            self.silence_frames += 1
+
+                            # 如果有句子正在进行中，且静音持续足够长时间，认为句子结束
+                            if self.sentence_in_progress and self.silence_frames >= self.silence_frames_threshold:
+                                sherpa_logger.info(f"检测到静音持续{self.silence_frames}帧，判定当前句子结束")
+
+                                # 如果有当前部分文本，将其作为完整句子提交
+                                if self._last_partial_result:
+                                    # 格式化文本
+                                    text = self._last_partial_result
+                                    text = _format_sentence(text)
 
-                while self.running:
-                    # 捕获音频数据
-                    data = mic.record(numframes=self.buffer_size)
-
-                    # 记录音频数据信息
-                    sherpa_logger.debug(f"捕获音频数据，形状: {data.shape}")
-
-                    # 转换为单声道
-                    if data.shape[1] > 1:
-                        data = np.mean(data, axis=1)
-                        sherpa_logger.debug(f"转换为单声道，形状: {data.shape}")
-
-                    # 检查音频数据是否有效
-                    max_amplitude = np.max(np.abs(data))
-
-                    # 静音检测
-                    if max_amplitude < self.silence_threshold:
-                        sherpa_logger.debug(f"检测到静音，最大振幅: {max_amplitude}，静音帧计数: {self.silence_frames}")
-                        self.silence_frames += 1
-
-                        # 如果有句子正在进行中，且静音持续足够长时间，认为句子结束
-                        if self.sentence_in_progress and self.silence_frames >= self.silence_frames_threshold:
-                            sherpa_logger.info(f"检测到静音持续{self.silence_frames}帧，判定当前句子结束")
-
-                            # 如果有当前部分文本，将其作为完整句子提交
-                            if self._last_partial_result:
-                                # 格式化文本
-                                text = self._last_partial_result
-                                if len(text) > 0:
-                                    text = text[0].upper() + text[1:]
-                                if text[-1] not in ['.', '?', '!']:
-                                    text += '.'
-
-                                sherpa_logger.info(f"静音检测触发句子结束，发送完整文本: {text}")
-                                self.new_text.emit(text)
-
-                                # 重置状态
-                                self._last_partial_result = ""
-                                self.sentence_in_progress = False
-                                self.last_sentence_end_time = time.time()
-
-                        # 如果静音时间太长，跳过此帧
-                        if self.silence_frames > 2:  # 允许短暂静音
-                            continue
-                    else:
-                        # 如果检测到声音，重置静音计数
-                        if self.silence_frames > 0:
-                            sherpa_logger.debug(f"检测到声音，重置静音帧计数，之前为: {self.silence_frames}")
-                            self.silence_frames = 0
-
-                        # 标记有句子正在进行中
-                        self.sentence_in_progress = True
-
-                    try:
-                        # 处理音频数据
-                        engine_type = getattr(self.recognizer, 'engine_type', None)
-                        sherpa_logger.debug(f"处理音频数据，引擎类型: {engine_type}")
-
-                        if engine_type and engine_type.startswith('sherpa'):
-                            # 对于 Sherpa-ONNX 模型，直接传递 numpy 数组
-                            sherpa_logger.debug(f"使用 Sherpa-ONNX 模型，直接传递 numpy 数组")
-                            accept_result = self.recognizer.AcceptWaveform(data)
-                        else:
-                            # 对于 Vosk 模型，转换为 16 位整数字节
-                            data_bytes = (data * 32767).astype(np.int16).tobytes()
-                            sherpa_logger.debug(f"使用 Vosk 模型，转换为 16 位整数字节，长度: {len(data_bytes)}")
-                            accept_result = self.recognizer.AcceptWaveform(data_bytes)
+                                    sherpa_logger.info(f"静音检测触发句子结束，发送完整文本: {text}")
+                                    emit_text(text)
+                                    pending_partial = None
+                                    last_partial = None
 
-                        sherpa_logger.debug(f"AcceptWaveform 结果: {accept_result}")
+                                    # 重置状态
+                                    self._last_partial_result = ""
+                                    self.sentence_in_progress = False
+                                    self.last_sentence_end_time = time.monotonic()
 
-                        if accept_result:
+                            # 只把最初几帧静音送入识别器（帮助其判断词尾），之后的静音帧不再解码
+                            if self.silence_frames > silence_grace:
+                                continue
+                        else:
+                            # 如果检测到声音，重置静音计数
+                            if self.silence_frames > 0:
+                                if debug:
+                                    sherpa_logger.debug(f"检测到声音，重置静音帧计数，之前为: {self.silence_frames}")
+                                self.silence_frames = 0
+
+                            # 标记有句子正在进行中
+                            self.sentence_in_progress = True
+
+                        # 处理音频数据：Sherpa-ONNX 模型直接接收 numpy 数组，Vosk 模型先转换为 16 位整数 PCM
+                        # 只在解码期间暂停循环垃圾回收（影响整个进程），避免回收停顿落在解码过程中；
+                        # 解码结束后立即恢复，积累的回收在两个音频块之间进行，长时间转录也不会堆积循环引用
+                        if gc_was_enabled:
+                            gc.disable()
+                        accept_result = accept(payload)
+                        if gc_was_enabled:
+                            gc.enable()
+
+                        if debug:
+                            sherpa_logger.debug(f"AcceptWaveform 结果: {accept_result}")
+
+                        if accept_result is None:
+                            # 音频已暂存到合并缓冲区，尚未送入识别器，没有新结果
+                            pass
+                        elif accept_result:
                             # 获取完整结果
-                            result = self.recognizer.Result()
+                            result = get_result()
                             sherpa_logger.info(f"完整结果: {result}, 类型: {type(result)}")
 
-                            text = self._parse_result(result)
+                            text = parse_result(result)
                             sherpa_logger.info(f"解析后的完整结果: {text}")
 
                             if text:
                                 sherpa_logger.info(f"发送完整文本: {text}")
-                                self.new_text.emit(text)
+                                emit_text(text)
+                                pending_partial = None
+                                last_partial = None
                             else:
                                 sherpa_logger.warning(f"完整文本为空，不发送")
                         else:
                             # 获取部分结果
-                            partial = self.recognizer.PartialResult()
-                            sherpa_logger.debug(f"部分结果: {partial}, 类型: {type(partial)}")
+                            partial = get_partial()
+                            if debug:
+                                sherpa_logger.debug(f"部分结果: {partial}, 类型: {type(partial)}")
 
-                            text = self._parse_partial_result(partial)
-                            sherpa_logger.debug(f"解析后的部分结果: {text}")
+                            text = parse_partial(partial)
+                            if debug:
+                                sherpa_logger.debug(f"解析后的部分结果: {text}")
 
                             # 保存最新的部分结果，无论是否发送
                             if text:
                                 self._last_partial_result = text
-                                print(f"在process中保存最新部分结果: {text}")
-
-                                # 检查是否需要因为静音而结束句子
-                                current_time = time.time()
-                                time_since_last_sentence = current_time - self.last_sentence_end_time
 
+                                # 检查是否需要因为静音而结束句子：
                                 # 如果静音持续足够长，且距离上次句子结束已经过了足够时间，认为是新句子
-                                if self.silence_frames >= self.silence_frames_threshold and time_since_last_sentence > 2.0:
+                                # （只有静音足够长时才读取时钟）
+                                current_time = None
+                                if self.silence_frames >= self.silence_frames_threshold:
+                                    current_time = time.monotonic()
+                                if current_time is not None and current_time - self.last_sentence_end_time > 2.0:
                                     # 格式化文本
                                     complete_text = text
-                                    if len(complete_text) > 0:
-                                        complete_text = complete_text[0].upper() + complete_text[1:]
-                                    if complete_text[-1] not in ['.', '?', '!']:
-                                        complete_text += '.'
+                                    complete_text = _format_sentence(complete_text)
 
                                     sherpa_logger.info(f"静音检测触发句子结束，发送完整文本: {complete_text}")
-                                    self.new_text.emit(complete_text)
+                                    emit_text(complete_text)
+                                    pending_partial = None
+                                    last_partial = None
 
                                     # 重置状态
                                     self._last_partial_result = ""
                                     self.sentence_in_progress = False
                                     self.last_sentence_end_time = current_time
                                 else:
-                                    # 正常发送部分文本
-                                    sherpa_logger.debug(f"发送部分文本: {text}")
-                                    self.new_text.emit("PARTIAL:" + text)
+                                    # 部分文本留到下一次进度更新时发送，期间更新的部分结果会覆盖它
+                                    if debug:
+                                        sherpa_logger.debug(f"暂存部分文本: {text}")
+                                    pending_partial = text
                             else:
-                                sherpa_logger.debug(f"部分文本为空，不发送")
-
-                        # 更新进度
-                        current_time = time.time()
-                        if current_time - last_progress_update >= 0.5:
-                            elapsed_seconds = current_time - start_time
-                            minutes = int(elapsed_seconds // 60)
-                            seconds = int(elapsed_seconds % 60)
-                            time_str = f"转录时长: {minutes:02d}:{seconds:02d}"
-                            self.progress.emit(50, time_str)
-                            last_progress_update = current_time
-
-                    except Exception as e:
-                        error_msg = f"音频处理错误: {str(e)}"
-                        self.error.emit(error_msg)
-                        sherpa_logger.error(error_msg)
-                        import traceback
-                        error_trace = traceback.format_exc()
-                        sherpa_logger.error(error_trace)
-                        print(error_trace)
+                                if debug:
+                                    sherpa_logger.debug(f"部分文本为空，不发送")
+
+                except Exception as e:
+                    # 解码过程中出错时恢复被暂停的垃圾回收
+                    if gc_was_enabled:
+                        gc.enable()
+                    # 堆栈已由日志记录器输出，无需再打印一次
+                    error_msg = f"音频处理错误: {str(e)}"
+                    self.error.emit(error_msg)
+                    sherpa_logger.error(error_msg)
+                    import traceback
+                    sherpa_logger.error(traceback.format_exc())
+
+            capture_thread.join(timeout=2.0)
+            if self._capture_error is not None:
+                raise self._capture_error
 
         except Exception as e:
             error_msg = f"音频捕获错误: {str(e)}"
@@ -260,388 +452,438 @@ class AudioWorker(QObject):
             import traceback
             error_trace = traceback.format_exc()
             sherpa_logger.error(error_trace)
-            print(error_trace)
         finally:
-            # 在结束前获取最终结果
-            try:
-                if hasattr(self, 'recognizer') and self.recognizer:
-                    sherpa_logger.info("获取最终识别结果")
-
-                    # 检查引擎类型
-                    engine_type = getattr(self.recognizer, 'engine_type', None)
-                    sherpa_logger.info(f"引擎类型: {engine_type}")
-
-                    # 获取最终结果
-                    if engine_type == "vosk_small" or engine_type == "vosk":
-                        final_result = self.recognizer.FinalResult()
-                        sherpa_logger.info(f"Vosk最终结果: {final_result}")
-
-                        # 解析最终结果
-                        if isinstance(final_result, str):
-                            try:
-                                result_json = json.loads(final_result)
-                                text = result_json.get('text', '').strip()
-                                sherpa_logger.info(f"解析后的最终结果: {text}")
-
-                                # 如果有文本，发送到UI
-                                if text:
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"发送最终文本: {text}")
-                                    self.new_text.emit(text)
-                                elif hasattr(self, '_last_partial_result') and self._last_partial_result:
-                                    # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
-                                    text = self._last_partial_result
-                                    # 记录使用的部分结果
-                                    sherpa_logger.info(f"使用的最后一个部分结果原始值: {text}")
-
-                                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                                    # 如果不是完整句子，可能是因为部分结果被截断了
-                                    if text and (" and " in text or text.endswith(" and")):
-                                        # 尝试从完整结果中找到匹配的句子
-                                        # 这里假设完整结果已经在UI中显示
-                                        try:
-                                            from src.ui.main_window import MainWindow
-                                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                                        # 查找最近的完整结果中是否包含当前部分结果
-                                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                                            if text in complete_text:
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果: {text}")
-                                                                break
-                                        except Exception as e:
-                                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
+            if gc_was_enabled:
+                gc.enable()
 
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
-                                    self.new_text.emit(text)
-                            except json.JSONDecodeError:
-                                sherpa_logger.error(f"解析最终结果JSON失败: {final_result}")
-
-                                # 如果JSON解析失败但有最后一个部分结果，使用部分结果作为最终结果
-                                if hasattr(self, '_last_partial_result') and self._last_partial_result:
-                                    text = self._last_partial_result
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"JSON解析失败，使用最后一个部分结果作为最终文本: {text}")
-                                    self.new_text.emit(text)
-                    else:
-                        # 对于其他模型，尝试调用FinalResult方法
-                        if hasattr(self.recognizer, 'FinalResult'):
-                            final_result = self.recognizer.FinalResult()
-                            sherpa_logger.info(f"其他模型最终结果: {final_result}")
-
-                            # 如果是字符串，尝试解析
-                            if isinstance(final_result, str):
-                                text = final_result.strip()
-                                if text:
-                                    sherpa_logger.info(f"发送最终文本: {text}")
-                                    self.new_text.emit(text)
-                                elif hasattr(self, '_last_partial_result') and self._last_partial_result:
-                                    # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
-                                    text = self._last_partial_result
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
-                                    self.new_text.emit(text)
-            except Exception as e:
-                sherpa_logger.error(f"获取最终结果错误: {e}")
-                import traceback
-                sherpa_logger.error(traceback.format_exc())
+            # 通知采集线程退出
+            if ring is not None:
+                ring.close()
 
-                # 如果获取最终结果失败但有最后一个部分结果，使用部分结果作为最终结果
-                if hasattr(self, '_last_partial_result') and self._last_partial_result:
-                    text = self._last_partial_result
-                    # 记录使用的部分结果
-                    sherpa_logger.info(f"获取最终结果失败，使用的最后一个部分结果原始值: {text}")
-
-                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                    # 如果不是完整句子，可能是因为部分结果被截断了
-                    if text and (" and " in text or text.endswith(" and")):
-                        # 尝试从完整结果中找到匹配的句子
-                        # 这里假设完整结果已经在UI中显示
-                        try:
-                            from src.ui.main_window import MainWindow
-                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                        # 查找最近的完整结果中是否包含当前部分结果
-                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                            if text in complete_text:
-                                                text = complete_text
-                                                sherpa_logger.info(f"找到匹配的完整结果: {text}")
-                                                break
-                        except Exception as e:
-                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
-
-                    # 格式化文本
-                    if len(text) > 0:
-                        text = text[0].upper() + text[1:]
-                    if text[-1] not in ['.', '?', '!']:
-                        text += '.'
-                    sherpa_logger.info(f"获取最终结果失败，使用最后一个部分结果作为最终文本: {text}")
-                    self.new_text.emit(text)
+            # 在结束前获取最终结果
+            final_text = self._finalize()
+            # 最终结果不在这里补全和发送：补全需要读取界面上的完整结果列表，
+            # 交给界面线程处理（排在之前已发送的识别结果之后投递）
+            self.final_result.emit(final_text or "", self._last_partial_result or "")
 
             sherpa_logger.info("音频处理结束")
             self.finished.emit()
 
-    def _parse_result(self, result):
-        """解析完整识别结果"""
-        try:
-            # 导入日志工具
-            try:
-                from src.utils.sherpa_logger import sherpa_logger
-            except ImportError:
-                # 如果导入失败，创建一个简单的日志记录器
-                class DummyLogger:
-                    def debug(self, msg): print(f"DEBUG: {msg}")
-                    def info(self, msg): print(f"INFO: {msg}")
-                    def warning(self, msg): print(f"WARNING: {msg}")
-                    def error(self, msg): print(f"ERROR: {msg}")
-                sherpa_logger = DummyLogger()
-
-            # 记录原始结果
-            sherpa_logger.debug(f"解析完整结果: {result}, 类型: {type(result)}")
+    def _finalize(self):
+        """
+        获取最终识别结果（处理结束时在工作线程调用）
 
-            # 检查引擎类型
-            engine_type = getattr(self.recognizer, 'engine_type', None)
-            sherpa_logger.debug(f"引擎类型: {engine_type}")
-
-            # 如果是Vosk引擎，特殊处理
-            if engine_type == "vosk_small" or engine_type == "vosk":
-                sherpa_logger.debug("使用Vosk特殊处理逻辑")
-                # Vosk引擎返回的是JSON字符串
-                if isinstance(result, str):
-                    try:
-                        result_json = json.loads(result)
-                        text = result_json.get('text', '').strip()
-                        sherpa_logger.debug(f"Vosk JSON解析结果: {text}")
-                    except json.JSONDecodeError:
-                        # 如果不是有效的JSON，直接使用文本
-                        text = result.strip()
-                        sherpa_logger.debug(f"Vosk非JSON结果: {text}")
-                else:
-                    # 如果不是字符串，尝试转换为字符串
-                    text = str(result).strip()
-                    sherpa_logger.debug(f"Vosk非字符串结果: {text}")
-
-                # 格式化文本
-                if text:
-                    if len(text) > 0:
-                        text = text[0].upper() + text[1:]
-                    if text[-1] not in ['.', '?', '!']:
-                        text += '.'
-                    sherpa_logger.debug(f"Vosk格式化后结果: {text}")
-                    return text
-                return None
+        先送入合并缓冲区中剩余的音频，再按引擎对应的解析方法解析 FinalResult。
+        这里不访问界面：最终结果为空时如何用最后一个部分结果补全，由发送最终结果的一方决定
 
-            # 如果是纯文本字符串（不是 JSON），直接使用
-            if isinstance(result, str) and not result.startswith('{'):
-                text = result.strip()
-                if text:
-                    # 格式化文本
-                    if len(text) > 0:
-                        text = text[0].upper() + text[1:]
-                    if text[-1] not in ['.', '?', '!']:
-                        text += '.'
-                return text
-
-            # 尝试解析 JSON 或其他格式
-            try:
-                if isinstance(result, str):
-                    result_json = json.loads(result)
-                elif hasattr(result, 'text'):
-                    result_json = {"text": result.text}
-                elif hasattr(result, '__str__'):
-                    result_json = {"text": str(result)}
-                else:
-                    return None
-
-                text = result_json.get('text', '').strip()
-                if text:
-                    # 格式化文本
-                    if len(text) > 0:
-                        text = text[0].upper() + text[1:]
-                    if text[-1] not in ['.', '?', '!']:
-                        text += '.'
-                    return text
-            except Exception as e:
-                sherpa_logger.error(f"解析结果错误: {e}")
-                # 如果解析失败，尝试直接使用结果
-                text = str(result).strip()
-                if text:
-                    # 格式化文本
-                    if len(text) > 0:
-                        text = text[0].upper() + text[1:]
-                    if text[-1] not in ['.', '?', '!']:
-                        text += '.'
-                    return text
+        Returns:
+            str: 格式化后的最终文本，没有结果或获取失败时返回 None
+        """
+        if not self.recognizer or not hasattr(self.recognizer, 'FinalResult'):
+            return None
+
+        sherpa_logger.info(f"获取最终识别结果，引擎类型: {self.engine_type}")
+        try:
+            self._flush_coalesced()
+            final_result = self.recognizer.FinalResult()
+            sherpa_logger.info(f"最终结果: {final_result}")
+            if isinstance(final_result, str):
+                return self._parse_result(final_result)
         except Exception as e:
-            print(f"_parse_result 错误: {e}")
+            sherpa_logger.error(f"获取最终结果错误: {e}")
             import traceback
-            print(traceback.format_exc())
-
+            sherpa_logger.error(traceback.format_exc())
         return None
 
-    def _parse_partial_result(self, partial):
-        """解析部分识别结果"""
+    def request_stop(self) -> None:
+        """请求停止处理（可在任意线程调用），处理循环在读取下一个音频块前退出"""
+        self.running = False
+
+    def _capture_loop(self, ring: AudioRingBuffer) -> None:
+        """
+        采集线程：从设备读取音频并写入环形缓冲区
+
+        Args:
+            ring: 与识别线程共享的环形缓冲区
+        """
         try:
-            # 导入日志工具
+            # 每个线程都需要单独初始化COM
             try:
-                from src.utils.sherpa_logger import sherpa_logger
-            except ImportError:
-                # 如果导入失败，创建一个简单的日志记录器
-                class DummyLogger:
-                    def debug(self, msg): print(f"DEBUG: {msg}")
-                    def info(self, msg): print(f"INFO: {msg}")
-                    def warning(self, msg): print(f"WARNING: {msg}")
-                    def error(self, msg): print(f"ERROR: {msg}")
-                sherpa_logger = DummyLogger()
-
-            # 记录原始结果
-            sherpa_logger.debug(f"解析部分结果: {partial}, 类型: {type(partial)}")
+                from src.utils.com_handler import com_handler
+                com_handler.initialize_com()
+            except Exception as e:
+                sherpa_logger.error(f"采集线程COM初始化错误: {e}")
 
-            # 检查引擎类型
-            engine_type = getattr(self.recognizer, 'engine_type', None)
-            sherpa_logger.debug(f"引擎类型: {engine_type}")
-
-            # 如果是Vosk引擎，特殊处理
-            if engine_type == "vosk_small" or engine_type == "vosk":
-                sherpa_logger.debug("使用Vosk特殊处理逻辑")
-                # Vosk引擎返回的是JSON字符串
-                if isinstance(partial, str):
-                    try:
-                        partial_json = json.loads(partial)
-                        partial_text = partial_json.get('partial', '').strip()
-                        sherpa_logger.debug(f"Vosk JSON解析部分结果: {partial_text}")
-
-                        # 格式化部分文本 - 首字母大写，但不添加句尾标点
-                        if partial_text:
-                            if len(partial_text) > 0:
-                                partial_text = partial_text[0].upper() + partial_text[1:]
-                            sherpa_logger.debug(f"Vosk格式化后的部分结果: {partial_text}")
-
-                        # 保存最新的部分结果，用于后续处理
-                        # 这对于在停止转录时获取最后一个单词特别有用
-                        self._last_partial_result = partial_text
-                        print(f"保存最新部分结果: {partial_text}")  # 添加打印，便于调试
-
-                        return partial_text
-                    except json.JSONDecodeError:
-                        # 如果不是有效的JSON，直接使用文本
-                        partial_text = partial.strip()
-                        sherpa_logger.debug(f"Vosk非JSON部分结果: {partial_text}")
-
-                        # 格式化部分文本
-                        if partial_text:
-                            if len(partial_text) > 0:
-                                partial_text = partial_text[0].upper() + partial_text[1:]
-
-                        # 保存最新的部分结果
-                        self._last_partial_result = partial_text
-                        print(f"保存最新部分结果(非JSON): {partial_text}")  # 添加打印，便于调试
-
-                        return partial_text
-                else:
-                    # 如果不是字符串，尝试转换为字符串
-                    partial_text = str(partial).strip()
-                    sherpa_logger.debug(f"Vosk非字符串部分结果: {partial_text}")
+            if not _raise_thread_priority():
+                sherpa_logger.debug("无法提升采集线程优先级，使用默认优先级")
 
-                    # 格式化部分文本
-                    if partial_text:
-                        if len(partial_text) > 0:
-                            partial_text = partial_text[0].upper() + partial_text[1:]
+            # 真实麦克风不走回环路径，避免额外的延迟和重采样
+            loopback = getattr(self.device, 'needs_loopback', True)
+            with _get_microphone(str(self.device.id), loopback).recorder(
+                samplerate=self.sample_rate
+            ) as mic:
+                self.status.emit(f"正在从 {self.device.name} 捕获音频...")
+                sherpa_logger.info(f"正在从 {self.device.name} 捕获音频...")
 
-                    # 保存最新的部分结果
-                    self._last_partial_result = partial_text
+                while self.running and not ring.closed:
+                    if not ring.put(mic.record(numframes=self.buffer_size)):
+                        sherpa_logger.warning(f"识别处理跟不上采集，丢弃音频块（累计 {ring.overruns} 块）")
+        except Exception as e:
+            self._capture_error = e
+        finally:
+            ring.close()
 
-                    return partial_text
+    def _downmix(self, data):
+        """
+        将多声道音频取平均下混为单声道，结果写入复用缓冲区
 
-            # 如果是纯文本字符串（不是 JSON），直接使用
-            if isinstance(partial, str) and not partial.startswith('{'):
-                partial_text = partial.strip()
+        使用与权重向量的点积完成求和与缩放，只遍历一次输入数据
 
-                # 格式化部分文本
-                if partial_text:
-                    if len(partial_text) > 0:
-                        partial_text = partial_text[0].upper() + partial_text[1:]
+        Args:
+            data: 形状为 (n, channels) 的 float32 音频数据
 
-                # 保存最新的部分结果
-                self._last_partial_result = partial_text
+        Returns:
+            np.ndarray: 单声道数据，在下一次调用前有效
+        """
+        n, channels = data.shape
+        if self._downmix_buf.shape[0] < n:
+            self._downmix_buf = np.empty(n, dtype=np.float32)
+        mono = self._downmix_buf[:n]
+        weights = self._downmix_weights
+        if weights is None or weights.shape[0] != channels:
+            weights = self._downmix_weights = np.full(channels, 1.0 / channels, dtype=np.float32)
+        np.dot(data, weights, out=mono)
+        return mono
+
+    def _prepare_f32(self, data):
+        """
+        准备送入 Sherpa-ONNX 的音频：下混为单声道 float32 数据并计算峰值
 
-                return partial_text
+        Args:
+            data: 形状为 (n, channels) 的 float32 音频数据
 
-            # 尝试解析 JSON 或其他格式
-            try:
-                if isinstance(partial, str):
-                    try:
-                        partial_json = json.loads(partial)
-                    except json.JSONDecodeError:
-                        partial_text = partial.strip()
-
-                        # 格式化部分文本
-                        if partial_text:
-                            if len(partial_text) > 0:
-                                partial_text = partial_text[0].upper() + partial_text[1:]
-
-                        # 保存最新的部分结果
-                        self._last_partial_result = partial_text
-
-                        return partial_text
-                elif isinstance(partial, dict):
-                    partial_json = partial
-                elif hasattr(partial, 'partial'):
-                    partial_json = {'partial': str(partial.partial)}
-                else:
-                    partial_json = {'partial': str(partial)}
+        Returns:
+            tuple: (单声道音频数据, 绝对值峰值；超过静音阈值时扫描提前结束，只保证不小于阈值)
+        """
+        data = self._downmix(data) if data.shape[1] > 1 else data.reshape(-1)
+        return data, _audio_fast.peak_abs(data, self.silence_threshold)
 
-                partial_text = partial_json.get('partial', '').strip()
+    def _prepare_pcm16(self, data):
+        """
+        准备送入 Vosk 的音频：单次遍历完成下混、峰值计算和 16 位 PCM 转换
 
-                # 格式化部分文本
-                if partial_text:
-                    if len(partial_text) > 0:
-                        partial_text = partial_text[0].upper() + partial_text[1:]
+        Args:
+            data: 形状为 (n, channels) 的 float32 音频数据
 
-                # 保存最新的部分结果
-                self._last_partial_result = partial_text
+        Returns:
+            tuple: (写入复用缓冲区的 int16 数组, 绝对值峰值)
+        """
+        n = data.shape[0]
+        if self._pcm_buf.shape[0] < n:
+            self._pcm_bytes = bytearray(2 * n)
+            self._pcm_buf = np.frombuffer(self._pcm_bytes, dtype=np.int16)
+            self._mono_buf = np.empty(n, dtype=np.float32)
+        return _audio_fast.f32_to_pcm16_peak(data, self._pcm_buf, self._mono_buf)
+
+    def _accept_pcm16(self, pcm) -> bool:
+        """
+        将 16 位 PCM 送入识别器（Vosk 路径）
 
-                return partial_text
-            except Exception as e:
-                sherpa_logger.error(f"解析部分结果错误: {e}")
-                # 如果解析失败，尝试直接使用结果
-                partial_text = str(partial).strip()
+        Args:
+            pcm: _prepare_pcm16 返回的 int16 数组
 
-                # 格式化部分文本
-                if partial_text:
-                    if len(partial_text) > 0:
-                        partial_text = partial_text[0].upper() + partial_text[1:]
+        Returns:
+            bool: 识别器的 AcceptWaveform 结果；音频暂存在合并缓冲区中尚未送入识别器时返回 None
+        """
+        n = pcm.shape[0]
+        # 整块写满时字节缓冲区本身就是完整的 PCM 数据，可直接送入识别器
+        raw = self._pcm_bytes if n == self._pcm_buf.shape[0] else None
+
+        if self.coalesce_samples > 0:
+            pcm = self._coalesce(pcm)
+            if pcm is None:
+                return None
+            raw = None
 
-                # 保存最新的部分结果
-                self._last_partial_result = partial_text
+        return self._feed_pcm16(pcm, raw)
+
+    def _accept_f32(self, data):
+        """
+        将 float32 音频合并后送入识别器（Sherpa-ONNX 路径，仅在启用合并时使用）
+
+        Args:
+            data: 单声道 float32 音频数据
+
+        Returns:
+            bool: 识别器的 AcceptWaveform 结果；音频暂存在合并缓冲区中尚未送入识别器时返回 None
+        """
+        data = self._coalesce(data)
+        if data is None:
+            return None
+        return self.recognizer.AcceptWaveform(data)
+
+    def _coalesce(self, chunk):
+        """
+        将音频块追加到合并缓冲区，凑满 coalesce_samples 后返回合并后的数据
+
+        将多个小块合并后一次送入识别器，摊薄每次调用的固定开销
+
+        Args:
+            chunk: 一维音频数组（int16 或 float32）
+
+        Returns:
+            np.ndarray: 合并后的数据（在下一次调用前有效），尚未凑满时返回 None
+        """
+        n = chunk.shape[0]
+        if self._accum is None or self._accum.shape[0] < self._accum_fill + n:
+            accum = np.empty(max(self.coalesce_samples, self._accum_fill) + n, dtype=chunk.dtype)
+            if self._accum is not None:
+                accum[:self._accum_fill] = self._accum[:self._accum_fill]
+            self._accum = accum
+        self._accum[self._accum_fill:self._accum_fill + n] = chunk
+        self._accum_fill += n
+        if self._accum_fill < self.coalesce_samples:
+            return None
+        merged = self._accum[:self._accum_fill]
+        self._accum_fill = 0
+        return merged
+
+    def _flush_coalesced(self):
+        """
+        将合并缓冲区中剩余的音频送入识别器
+
+        Returns:
+            bool: 识别器的 AcceptWaveform 结果；缓冲区为空时返回 None
+        """
+        if not self._accum_fill:
+            return None
+        merged = self._accum[:self._accum_fill]
+        self._accum_fill = 0
+        if self._is_vosk:
+            return self._feed_pcm16(merged)
+        return self.recognizer.AcceptWaveform(merged)
+
+    def _feed_pcm16(self, pcm, raw=None):
+        """
+        将 16 位 PCM 数组送入识别器
+
+        Args:
+            pcm: int16 数组
+            raw: 与 pcm 共享内存的 bytearray（可选）
+
+        Returns:
+            bool: 识别器的 AcceptWaveform 结果
+        """
+        # 优先传入 memoryview 或复用的 bytearray，都不支持时才用 tobytes() 复制
+        if self._pcm_input is None:
+            # 首次调用时依次探测，结果缓存供后续音频块使用
+            for kind, buf in (('memoryview', memoryview(pcm).cast('B')), ('bytearray', raw)):
+                if buf is None:
+                    continue
+                try:
+                    result = self.recognizer.AcceptWaveform(buf)
+                    self._pcm_input = kind
+                    return result
+                except TypeError:
+                    pass
+            self._pcm_input = 'bytes'
+        elif self._pcm_input == 'memoryview':
+            return self.recognizer.AcceptWaveform(memoryview(pcm).cast('B'))
+        elif self._pcm_input == 'bytearray' and raw is not None:
+            return self.recognizer.AcceptWaveform(raw)
+        return self.recognizer.AcceptWaveform(pcm.tobytes())
+
+    def _parse_vosk_result(self, result, _loads=_json_loads):
+        """解析Vosk完整识别结果（JSON字符串）"""
+        # 空完整结果无需解析
+        if result == _EMPTY_VOSK_RESULT:
+            return None
+        if self._debug:
+            sherpa_logger.debug(f"解析Vosk完整结果: {result}")
+        try:
+            text = _loads(result).get('text', '').strip()
+        except Exception:
+            # 如果不是有效的JSON，直接使用文本
+            text = str(result).strip()
+        return _format_sentence(text) if text else None
+
+    def _parse_generic_result(self, result, _loads=_json_loads):
+        """解析其他引擎的完整识别结果（纯文本、JSON字符串或带text属性的对象）"""
+        if self._debug:
+            sherpa_logger.debug(f"解析完整结果: {result}, 类型: {type(result)}")
+        if isinstance(result, str):
+            text = result
+            if result.startswith('{'):
+                try:
+                    text = _loads(result).get('text', '')
+                except Exception:
+                    # 如果解析失败，直接使用结果
+                    pass
+        else:
+            text = getattr(result, 'text', result)
+        text = str(text).strip()
+        return _format_sentence(text) if text else None
+
+    def _parse_vosk_partial(self, partial, _loads=_json_loads):
+        """解析Vosk部分识别结果（JSON字符串），格式化为首字母大写，不添加句尾标点"""
+        # 空部分结果出现频率最高，无需解析
+        if partial == _EMPTY_VOSK_PARTIAL:
+            text = ""
+        else:
+            if self._debug:
+                sherpa_logger.debug(f"解析Vosk部分结果: {partial}")
+            try:
+                text = _loads(partial).get('partial', '').strip()
+            except Exception:
+                # 如果不是有效的JSON，直接使用文本
+                text = str(partial).strip()
+            text = _capitalize_first(text)
+
+        # 保存最新的部分结果，停止转录时用于补全最后一个单词
+        self._last_partial_result = text
+        return text
+
+    def _parse_generic_partial(self, partial, _loads=_json_loads):
+        """解析其他引擎的部分识别结果（纯文本、JSON字符串、字典或带partial属性的对象）"""
+        if self._debug:
+            sherpa_logger.debug(f"解析部分结果: {partial}, 类型: {type(partial)}")
+        if isinstance(partial, str):
+            text = partial
+            if partial.startswith('{'):
+                try:
+                    text = _loads(partial).get('partial', '')
+                except Exception:
+                    # 如果解析失败，直接使用结果
+                    pass
+        elif isinstance(partial, dict):
+            text = partial.get('partial', '')
+        else:
+            text = getattr(partial, 'partial', partial)
+        text = _capitalize_first(str(text).strip())
+
+        # 保存最新的部分结果，停止转录时用于补全最后一个单词
+        self._last_partial_result = text
+        return text
+
+
+def _resolve_final_text(text: str, transcript_text: list) -> str:
+    """
+    在已显示的完整结果中查找与最后一个部分结果匹配的句子（停止捕获时使用）
+
+    从最近的结果开始，对每条完整结果依次尝试"and"结尾的特殊匹配、前缀匹配、
+    子串匹配和单词重合度匹配，只遍历一遍列表，命中即返回。
+    部分结果可能因停止捕获而被截断，匹配到时用完整句子代替
+
+    Args:
+        text: 最后一个部分结果
+        transcript_text: 字幕窗口中的完整结果列表
+
+    Returns:
+        str: 匹配到的完整句子，没有匹配时返回原文本
+    """
+    # 打印完整的transcript_text列表，便于调试
+    sherpa_logger.info(f"当前完整文本列表: {transcript_text}")
+
+    # 去掉末尾"and"后的文本只计算一次
+    # 注意：rstrip(" and") 去除的是字符集合而不是后缀（"hand" 会变成 "h"），这里按后缀切片
+    ends_with_and = text.endswith(" and")
+    has_and = ends_with_and or " and " in text
+    text_no_and = text[:-4] if ends_with_and else text
+    if has_and:
+        sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
+
+    # 部分结果的单词集合和相似度阈值在整个查找过程中不变，只计算一次
+    # 只对较长的部分结果进行相似度检查
+    check_similarity = len(text) > 10
+    partial_words = text.split()
+    partial_set = frozenset(partial_words)
+    partial_words_no_and = text_no_and.split() if ends_with_and else None
+    partial_set_no_and = frozenset(partial_words_no_and) if partial_words_no_and else None
+    # 相似度阈值：共同单词数量达到部分结果单词数量的80%
+    threshold = 0.8 * len(partial_words)
+    threshold_no_and = 0.8 * len(partial_words_no_and) if partial_words_no_and else 0
+
+    for complete_text in reversed(transcript_text):
+        # 检查是否有包含相同前缀但更完整的句子（"and"特殊处理）
+        if has_and and complete_text.startswith(text_no_and) and "and " in complete_text:
+            sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {complete_text}")
+            return complete_text
+        # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中（前缀也属于这种情况）
+        if ends_with_and and text_no_and and text_no_and in complete_text:
+            sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {complete_text}")
+            return complete_text
+        # 检查部分结果是否包含在完整结果中（前缀也属于这种情况）
+        if text in complete_text:
+            sherpa_logger.info(f"找到匹配的完整结果(子串匹配): {complete_text}")
+            return complete_text
+        # 检查完整结果是否包含部分结果的大部分内容
+        if check_similarity:
+            # 完整结果的单词列表直接与部分结果的集合求交，无需再构造一个集合
+            complete_words = complete_text.split()
+            # 如果共同单词的数量超过部分结果单词数量的80%，认为匹配
+            if len(partial_set.intersection(complete_words)) >= threshold:
+                sherpa_logger.info(f"找到匹配的完整结果(相似度匹配): {complete_text}")
+                return complete_text
+            # 如果部分结果以"and"结尾，特殊处理：计算去掉"and"后的相似度
+            if partial_set_no_and and len(partial_set_no_and.intersection(complete_words)) >= threshold_no_and:
+                sherpa_logger.info(f"找到匹配的完整结果(相似度匹配-去除and): {complete_text}")
+                return complete_text
+
+    return text
+
+
+@functools.lru_cache(maxsize=1)
+def _enumerate_devices() -> tuple:
+    """
+    枚举所有扬声器和麦克风（包括回环设备）
+
+    枚举需要查询系统音频接口（Windows 上涉及 COM），耗时较长，结果会被缓存；
+    枚举失败时抛出的异常不会被缓存
+
+    Returns:
+        tuple: AudioDevice 元组
+    """
+    return tuple([AudioDevice(s.id, s.name, False) for s in sc.all_speakers()] +
+                 [AudioDevice(m.id, m.name, True, getattr(m, 'isloopback', False))
+                  for m in sc.all_microphones(include_loopback=True)])
+
+
+@functools.lru_cache(maxsize=8)
+def _get_microphone(device_id: str, include_loopback: bool):
+    """
+    按设备ID查找录音设备
+
+    查找过程需要枚举系统设备，结果会被缓存，重复开始转录时直接复用；
+    每次转录仍会重新打开录音流，避免读到两次转录之间积压的旧音频
+
+    Args:
+        device_id: 设备ID
+        include_loopback: 是否包括回环设备
+
+    Returns:
+        录音设备对象
+    """
+    return sc.get_microphone(id=device_id, include_loopback=include_loopback)
+
+
+# 设备缓存的有效期（秒），过期后重新枚举，使新插入的设备能够出现、已拔出的设备不再返回旧句柄
+_DEVICE_CACHE_TTL = 30.0
+_device_cache_time = float('-inf')  # 上次清空设备缓存的时间（单调时钟）
+
+
+def _clear_device_cache() -> None:
+    """清空设备枚举和录音设备查找的缓存"""
+    global _device_cache_time
+    _enumerate_devices.cache_clear()
+    _get_microphone.cache_clear()
+    _device_cache_time = time.monotonic()
+
+
+def _expire_device_cache() -> None:
+    """设备缓存超过有效期时清空，下次访问时重新枚举"""
+    if time.monotonic() - _device_cache_time > _DEVICE_CACHE_TTL:
+        _clear_device_cache()
 
-                return partial_text
-        except Exception as e:
-            print(f"_parse_partial_result 错误: {e}")
-            import traceback
-            print(traceback.format_exc())
-            return ""
 
 class AudioProcessor(QObject):
     """音频处理器类"""
@@ -650,6 +892,7 @@ class AudioProcessor(QObject):
     error_signal = pyqtSignal(str)
     status_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int, str)
+    capture_finished = pyqtSignal()  # 工作线程结束且最终结果已发送（停止后保存转录文本等操作连接此信号）
 
     def __init__(self, signals: TranscriptionSignals):
         super().__init__()
@@ -658,35 +901,39 @@ class AudioProcessor(QObject):
         self.is_capturing = False
         self.capture_thread = None
         self.sample_rate = 16000
-        self.buffer_size = 4000
+        self.buffer_size = 320  # 每次从设备读取的样本数（16kHz 下 20ms），静音检测按此粒度进行
+        self.coalesce_samples = 1600  # 累积到该样本数（100ms）后再送入识别器，摊薄识别器调用开销
+        self.auto_buffer_size = False  # 启动时根据识别器实测延迟自动选择 buffer_size
+        self.cpu_affinity = None  # 识别线程绑定的 CPU 核心集合（仅 Linux 有效），None 表示不绑定
         self.worker_thread = None
 
     def get_audio_devices(self) -> List[AudioDevice]:
         """
         获取音频设备列表
 
+        枚举结果在所有实例间共享缓存，超过 _DEVICE_CACHE_TTL 秒后自动重新枚举，
+        也可以调用 refresh_devices 立即重新枚举
+
         Returns:
             List[AudioDevice]: 音频设备列表
         """
-        devices = []
-
+        _expire_device_cache()
         try:
-            # 获取所有输入设备
-            speakers = sc.all_speakers()
-            for speaker in speakers:
-                devices.append(AudioDevice(speaker.id, speaker.name, False))
-
-            # 获取所有输出设备
-            mics = sc.all_microphones(include_loopback=True)
-            for mic in mics:
-                devices.append(AudioDevice(mic.id, mic.name, True))
-
-            return devices
-
+            return list(_enumerate_devices())
         except Exception as e:
             print(f"获取音频设备失败: {e}")
             return []
 
+    def refresh_devices(self) -> List[AudioDevice]:
+        """
+        清除设备缓存并重新枚举（设备插拔后调用）
+
+        Returns:
+            List[AudioDevice]: 音频设备列表
+        """
+        _clear_device_cache()
+        return self.get_audio_devices()
+
     def set_current_device(self, device: AudioDevice) -> bool:
         """
         设置当前设备
@@ -712,6 +959,18 @@ class AudioProcessor(QObject):
             self.error_signal.emit("未选择音频设备")
             return False
 
+        # 预先编译音频转换内核，避免首个音频块承担 JIT 编译延迟
+        _audio_fast.warmup()
+
+        # 录音设备句柄可能已过期（设备被拔出或重新插入），超过有效期时重新查找
+        _expire_device_cache()
+
+        if self.auto_buffer_size:
+            self._tune_buffer_size(recognizer)
+
+        # 上一次转录的工作线程可能仍在获取最终结果，新的工作线程会使用同一个识别器，先等待它结束
+        self.wait_for_worker()
+
         # 创建工作线程
         self.worker_thread = QThread()
         self.worker = AudioWorker(
@@ -720,6 +979,8 @@ class AudioProcessor(QObject):
             self.buffer_size,
             recognizer
         )
+        self.worker.coalesce_samples = self.coalesce_samples
+        self.worker.cpu_affinity = self.cpu_affinity
         self.worker.moveToThread(self.worker_thread)
 
         # 连接信号
@@ -728,426 +989,98 @@ class AudioProcessor(QObject):
         self.worker.finished.connect(self.worker.deleteLater)
         self.worker_thread.finished.connect(self.worker_thread.deleteLater)
 
-        # 转发信号到TranscriptionSignals实例
-        self.worker.new_text.connect(lambda x: self.signals.new_text.emit(x))
-        self.worker.error.connect(lambda x: self.signals.error_occurred.emit(x))
-        self.worker.status.connect(lambda x: self.signals.status_updated.emit(x))
-        self.worker.progress.connect(lambda x, y: self.signals.progress_updated.emit(x, y))
-
-        # 启动线程
+        # 转发信号到TranscriptionSignals实例（信号直接连接信号，由Qt完成转发，不经过Python回调）；
+        # 显式使用队列连接，识别线程发出信号后立即返回，由界面线程的事件循环投递
+        self.worker.new_text.connect(self.signals.new_text, Qt.QueuedConnection)
+        self.worker.partial_text.connect(self.signals.partial_result, Qt.QueuedConnection)
+        self.worker.error.connect(self.signals.error_occurred, Qt.QueuedConnection)
+        self.worker.status.connect(self.signals.status_updated, Qt.QueuedConnection)
+        self.worker.progress.connect(self.signals.progress_updated, Qt.QueuedConnection)
+        # 最终结果需要读取字幕窗口，在本对象所在的界面线程中补全并发送
+        self.worker.final_result.connect(self._on_final_result, Qt.QueuedConnection)
+
+        # 启动线程（提高识别线程优先级，减少被界面和后台任务抢占造成的卡顿）
         self.is_capturing = True
-        self.worker_thread.start()
+        self.worker_thread.start(QThread.HighPriority)
 
         return True
 
-    def stop_capture(self) -> bool:
-        """停止捕获音频"""
-        if not self.is_capturing:
-            return False
-
-        # 导入日志工具
-        try:
-            from src.utils.sherpa_logger import sherpa_logger
-        except ImportError:
-            # 如果导入失败，创建一个简单的日志记录器
-            class DummyLogger:
-                def debug(self, msg): print(f"DEBUG: {msg}")
-                def info(self, msg): print(f"INFO: {msg}")
-                def warning(self, msg): print(f"WARNING: {msg}")
-                def error(self, msg): print(f"ERROR: {msg}")
-            sherpa_logger = DummyLogger()
-
-        # 标记停止状态，防止在停止后继续处理部分结果
-        if hasattr(self, 'worker') and self.worker:
-            self.worker.running = False
-            sherpa_logger.info("已标记工作线程为停止状态")
-
-        # 在停止捕获前，获取最终结果
-        try:
-            if hasattr(self, 'worker') and self.worker and hasattr(self.worker, 'recognizer'):
-                recognizer = self.worker.recognizer
-                sherpa_logger.info("获取最终识别结果")
+    def _tune_buffer_size(self, recognizer: Any) -> None:
+        """
+        根据识别器实测延迟选择 buffer_size
 
-                # 检查引擎类型
-                engine_type = getattr(recognizer, 'engine_type', None)
-                sherpa_logger.info(f"引擎类型: {engine_type}")
+        用 10 个 1600 样本的静音块预热识别器，取 AcceptWaveform 延迟的中位数，
+        使一个音频块的时长约为推理耗时的 3 倍（向上取 2 的幂，限制在 [800, 16000]）。
+        预热结束后重置识别器；无法重置的识别器不做调整，避免静音数据影响识别结果。
 
-                # 获取最终结果
-                try:
-                    # 对于Vosk模型，调用FinalResult方法
-                    if engine_type == "vosk_small" or engine_type == "vosk":
-                        final_result = recognizer.FinalResult()
-                        sherpa_logger.info(f"Vosk最终结果: {final_result}")
-
-                        # 解析最终结果
-                        if isinstance(final_result, str):
-                            try:
-                                result_json = json.loads(final_result)
-                                text = result_json.get('text', '').strip()
-                                sherpa_logger.info(f"解析后的最终结果: {text}")
-
-                                # 如果有文本，发送到UI
-                                if text:
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"发送最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                                elif hasattr(self.worker, '_last_partial_result') and self.worker._last_partial_result:
-                                    # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
-                                    # 注意：此时self.worker._last_partial_result可能已经是匹配过的完整结果
-                                    # 因为在SubtitleWidget的update_text方法中，我们已经尝试匹配完整结果
-                                    text = self.worker._last_partial_result
-                                    # 记录使用的部分结果
-                                    sherpa_logger.info(f"使用的最后一个部分结果原始值: {text}")
-
-                                    # 尝试查找匹配的完整句子
-                                    try:
-                                        from src.ui.main_window import MainWindow
-                                        if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                            if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                subtitle_widget = MainWindow.instance.subtitle_widget
-                                                if hasattr(subtitle_widget, '_find_matching_complete_text'):
-                                                    matched_text = subtitle_widget._find_matching_complete_text(text)
-                                                    if matched_text:
-                                                        sherpa_logger.info(f"找到匹配的完整句子: {matched_text}")
-                                                        text = matched_text
-                                    except Exception as e:
-                                        sherpa_logger.error(f"尝试查找匹配的完整句子时出错: {e}")
-
-                                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                                    # 如果不是完整句子，可能是因为部分结果被截断了
-                                    if text:
-                                        # 尝试从完整结果中找到匹配的句子
-                                        # 这里假设完整结果已经在UI中显示
-                                        try:
-                                            from src.ui.main_window import MainWindow
-                                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                                        # 打印完整的transcript_text列表，便于调试
-                                                        sherpa_logger.info(f"当前完整文本列表: {subtitle_widget.transcript_text}")
-
-                                                        # 首先检查是否有以"and"结尾的部分结果
-                                                        if " and " in text or text.endswith(" and"):
-                                                            sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
-                                                            # 特殊处理以"and"结尾的情况
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查是否有包含相同前缀但更完整的句子
-                                                                if complete_text.startswith(text.rstrip(" and")) and "and " in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {text}")
-                                                                    break
-
-                                                        # 如果没有找到匹配，继续使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            # 查找最近的完整结果中是否包含当前部分结果
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果是否是完整结果的前缀（去掉末尾的"and"）
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and complete_text.startswith(prefix):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(前缀匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and prefix in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                                            # 检查部分结果是否是完整结果的前缀
-                                                            if complete_text.startswith(text):
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(前缀匹配): {text}")
-                                                                break
-                                                            # 检查部分结果是否包含在完整结果中
-                                                            elif text in complete_text:
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(子串匹配): {text}")
-                                                                break
-                                                            # 检查完整结果是否包含部分结果的大部分内容
-                                                            elif len(text) > 10:  # 只对较长的部分结果进行相似度检查
-                                                                # 计算部分结果的单词
-                                                                partial_words = text.split()
-                                                                # 计算完整结果的单词
-                                                                complete_words = complete_text.split()
-                                                                # 计算共同单词的数量
-                                                                common_words = set(partial_words) & set(complete_words)
-                                                                # 如果共同单词的数量超过部分结果单词数量的80%，认为匹配
-                                                                if len(common_words) >= 0.8 * len(partial_words):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(相似度匹配): {text}")
-                                                                    break
-
-                                                                # 如果部分结果以"and"结尾，特殊处理
-                                                                if text.endswith(" and"):
-                                                                    # 计算去掉"and"后的相似度
-                                                                    partial_words_no_and = text.rstrip(" and").split()
-                                                                    if partial_words_no_and:
-                                                                        common_words_no_and = set(partial_words_no_and) & set(complete_words)
-                                                                        if len(common_words_no_and) >= 0.8 * len(partial_words_no_and):
-                                                                            text = complete_text
-                                                                            sherpa_logger.info(f"找到匹配的完整结果(相似度匹配-去除and): {text}")
-                                                                            break
-                                        except Exception as e:
-                                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
+        Args:
+            recognizer: 识别器
+        """
+        engine_type = getattr(recognizer, 'engine_type', None)
+        if engine_type in _VOSK_ENGINES:
+            reset = getattr(recognizer, 'Reset', None)
+            chunk = bytes(2 * 1600)
+        else:
+            reset = getattr(recognizer, 'reset_stream', None)
+            chunk = np.zeros(1600, dtype=np.float32)
+        if reset is None:
+            return
+
+        latencies = []
+        try:
+            for _ in range(10):
+                start = time.monotonic()
+                recognizer.AcceptWaveform(chunk)
+                latencies.append(time.monotonic() - start)
+        except Exception as e:
+            sherpa_logger.warning(f"测量识别器延迟失败，保持 buffer_size={self.buffer_size}: {e}")
+            return
+        finally:
+            # 无论预热是否成功都重置识别器，预热送入的静音不能留在首次转录使用的流中
+            try:
+                reset()
+            except Exception as e:
+                sherpa_logger.warning(f"预热后重置识别器失败: {e}")
+
+        latencies.sort()
+        median = latencies[len(latencies) // 2]
+        target = max(1, int(3 * median * self.sample_rate))
+        buffer_size = min(16000, max(800, 1 << (target - 1).bit_length()))
+        sherpa_logger.info(
+            f"识别器延迟中位数 {median * 1000:.1f}ms，buffer_size: {self.buffer_size} -> {buffer_size}"
+        )
+        self.buffer_size = buffer_size
 
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                            except json.JSONDecodeError:
-                                sherpa_logger.error(f"解析最终结果JSON失败: {final_result}")
-
-                                # 如果JSON解析失败但有最后一个部分结果，使用部分结果作为最终结果
-                                if hasattr(self.worker, '_last_partial_result') and self.worker._last_partial_result:
-                                    text = self.worker._last_partial_result
-                                    # 记录使用的部分结果
-                                    sherpa_logger.info(f"JSON解析失败，使用的最后一个部分结果原始值: {text}")
-
-                                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                                    # 如果不是完整句子，可能是因为部分结果被截断了
-                                    if text:
-                                        # 尝试从完整结果中找到匹配的句子
-                                        # 这里假设完整结果已经在UI中显示
-                                        try:
-                                            from src.ui.main_window import MainWindow
-                                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                                        # 打印完整的transcript_text列表，便于调试
-                                                        sherpa_logger.info(f"当前完整文本列表: {subtitle_widget.transcript_text}")
-
-                                                        # 首先检查是否有以"and"结尾的部分结果
-                                                        if " and " in text or text.endswith(" and"):
-                                                            sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
-                                                            # 特殊处理以"and"结尾的情况
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查是否有包含相同前缀但更完整的句子
-                                                                if complete_text.startswith(text.rstrip(" and")) and "and " in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {text}")
-                                                                    break
-
-                                                        # 如果没有找到匹配，继续使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            # 查找最近的完整结果中是否包含当前部分结果
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果是否是完整结果的前缀（去掉末尾的"and"）
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and complete_text.startswith(prefix):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(前缀匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and prefix in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                                            # 检查部分结果是否是完整结果的前缀
-                                                            if complete_text.startswith(text):
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(前缀匹配): {text}")
-                                                                break
-                                                            # 检查部分结果是否包含在完整结果中
-                                                            elif text in complete_text:
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(子串匹配): {text}")
-                                                                break
-                                                            # 检查完整结果是否包含部分结果的大部分内容
-                                                            elif len(text) > 10:  # 只对较长的部分结果进行相似度检查
-                                                                # 计算部分结果的单词
-                                                                partial_words = text.split()
-                                                                # 计算完整结果的单词
-                                                                complete_words = complete_text.split()
-                                                                # 计算共同单词的数量
-                                                                common_words = set(partial_words) & set(complete_words)
-                                                                # 如果共同单词的数量超过部分结果单词数量的80%，认为匹配
-                                                                if len(common_words) >= 0.8 * len(partial_words):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(相似度匹配): {text}")
-                                                                    break
-
-                                                                # 如果部分结果以"and"结尾，特殊处理
-                                                                if text.endswith(" and"):
-                                                                    # 计算去掉"and"后的相似度
-                                                                    partial_words_no_and = text.rstrip(" and").split()
-                                                                    if partial_words_no_and:
-                                                                        common_words_no_and = set(partial_words_no_and) & set(complete_words)
-                                                                        if len(common_words_no_and) >= 0.8 * len(partial_words_no_and):
-                                                                            text = complete_text
-                                                                            sherpa_logger.info(f"找到匹配的完整结果(相似度匹配-去除and): {text}")
-                                                                            break
-                                        except Exception as e:
-                                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
+    def stop_capture(self) -> bool:
+        """
+        停止捕获音频
 
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"JSON解析失败，使用最后一个部分结果作为最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                    else:
-                        # 对于其他模型，尝试调用FinalResult方法
-                        if hasattr(recognizer, 'FinalResult'):
-                            final_result = recognizer.FinalResult()
-                            sherpa_logger.info(f"其他模型最终结果: {final_result}")
-
-                            # 如果是字符串，尝试解析
-                            if isinstance(final_result, str):
-                                text = final_result.strip()
-                                if text:
-                                    sherpa_logger.info(f"发送最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                                elif hasattr(self.worker, '_last_partial_result') and self.worker._last_partial_result:
-                                    # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
-                                    text = self.worker._last_partial_result
-                                    # 记录使用的部分结果
-                                    sherpa_logger.info(f"其他模型使用的最后一个部分结果原始值: {text}")
-
-                                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                                    # 如果不是完整句子，可能是因为部分结果被截断了
-                                    if text:
-                                        # 尝试从完整结果中找到匹配的句子
-                                        # 这里假设完整结果已经在UI中显示
-                                        try:
-                                            from src.ui.main_window import MainWindow
-                                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                                        # 打印完整的transcript_text列表，便于调试
-                                                        sherpa_logger.info(f"当前完整文本列表: {subtitle_widget.transcript_text}")
-
-                                                        # 首先检查是否有以"and"结尾的部分结果
-                                                        if " and " in text or text.endswith(" and"):
-                                                            sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
-                                                            # 特殊处理以"and"结尾的情况
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查是否有包含相同前缀但更完整的句子
-                                                                if complete_text.startswith(text.rstrip(" and")) and "and " in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {text}")
-                                                                    break
-
-                                                        # 如果没有找到匹配，继续使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            # 查找最近的完整结果中是否包含当前部分结果
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果是否是完整结果的前缀（去掉末尾的"and"）
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and complete_text.startswith(prefix):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(前缀匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and prefix in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                                            # 检查部分结果是否是完整结果的前缀
-                                                            if complete_text.startswith(text):
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(前缀匹配): {text}")
-                                                                break
-                                                            # 检查部分结果是否包含在完整结果中
-                                                            elif text in complete_text:
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(子串匹配): {text}")
-                                                                break
-                                                            # 检查完整结果是否包含部分结果的大部分内容
-                                                            elif len(text) > 10:  # 只对较长的部分结果进行相似度检查
-                                                                # 计算部分结果的单词
-                                                                partial_words = text.split()
-                                                                # 计算完整结果的单词
-                                                                complete_words = complete_text.split()
-                                                                # 计算共同单词的数量
-                                                                common_words = set(partial_words) & set(complete_words)
-                                                                # 如果共同单词的数量超过部分结果单词数量的80%，认为匹配
-                                                                if len(common_words) >= 0.8 * len(partial_words):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(相似度匹配): {text}")
-                                                                    break
-
-                                                                # 如果部分结果以"and"结尾，特殊处理
-                                                                if text.endswith(" and"):
-                                                                    # 计算去掉"and"后的相似度
-                                                                    partial_words_no_and = text.rstrip(" and").split()
-                                                                    if partial_words_no_and:
-                                                                        common_words_no_and = set(partial_words_no_and) & set(complete_words)
-                                                                        if len(common_words_no_and) >= 0.8 * len(partial_words_no_and):
-                                                                            text = complete_text
-                                                                            sherpa_logger.info(f"找到匹配的完整结果(相似度匹配-去除and): {text}")
-                                                                            break
-                                        except Exception as e:
-                                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
+        只请求工作线程停止，不等待它结束：工作线程获取最终结果后，
+        由 _on_final_result 在界面线程中补全并发送，随后发出 capture_finished 信号
+        """
+        if not self.is_capturing:
+            return False
 
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                except Exception as e:
-                    sherpa_logger.error(f"获取最终结果错误: {e}")
-                    import traceback
-                    sherpa_logger.error(traceback.format_exc())
-        except Exception as e:
-            sherpa_logger.error(f"处理最终结果时发生错误: {e}")
-            import traceback
-            sherpa_logger.error(traceback.format_exc())
+        # worker 和 worker_thread 只读取一次，后续不再逐个探测属性是否存在
+        worker = getattr(self, 'worker', None)
+        worker_thread = getattr(self, 'worker_thread', None)
 
         # 添加安全检查，防止访问已删除的对象
         try:
-            # 首先设置worker的running标志为False
-            if hasattr(self, 'worker') and self.worker:
+            # 首先请求worker停止，防止在停止后继续处理部分结果
+            if worker:
                 try:
-                    self.worker.running = False
+                    worker.request_stop()
+                    sherpa_logger.info("已标记工作线程为停止状态")
                 except RuntimeError as e:
                     # 如果worker对象已被删除，记录错误但继续执行
                     sherpa_logger.warning(f"警告: 设置worker.running=False时出错: {e}")
 
-            # 然后尝试停止线程
-            if hasattr(self, 'worker_thread') and self.worker_thread:
+            # 然后请求线程在处理结束后退出事件循环（不阻塞调用线程）
+            if worker_thread:
                 try:
-                    # 检查线程是否仍在运行
-                    if self.worker_thread.isRunning():
-                        self.worker_thread.quit()
-                        # 设置较短的超时时间，避免长时间等待
-                        if not self.worker_thread.wait(1000):  # 等待最多1秒
-                            sherpa_logger.warning("警告: 线程未能在1秒内停止")
+                    if worker_thread.isRunning():
+                        worker_thread.quit()
                 except RuntimeError as e:
                     # 如果线程对象已被删除，记录错误但继续执行
                     sherpa_logger.warning(f"警告: 停止线程时出错: {e}")
@@ -1161,231 +1094,70 @@ class AudioProcessor(QObject):
         self.is_capturing = False
         return True
 
-    def _capture_audio_thread(self, recognizer: Any) -> None:
+    def wait_for_worker(self, timeout_ms: int = 3000) -> bool:
         """
-        音频捕获线程（已废弃）
+        等待工作线程结束
 
-        此方法已废弃，请使用AudioWorker类和QThread代替。
-        保留此方法仅为兼容性目的。
+        处理循环最多阻塞0.5秒读取音频，之后还要获取最终结果，默认留出3秒
 
         Args:
-            recognizer: 识别器实例
+            timeout_ms: 最长等待时间（毫秒）
+
+        Returns:
+            bool: 工作线程是否已经结束
         """
-        print("警告: _capture_audio_thread方法已废弃，请使用AudioWorker类和QThread")
-        # 使用start_capture方法代替
-        self.start_capture(recognizer)
-        return
+        worker_thread = getattr(self, 'worker_thread', None)
+        if worker_thread is None:
+            return True
+        try:
+            if not worker_thread.isRunning():
+                return True
+            worker_thread.quit()
+            if worker_thread.wait(timeout_ms):
+                return True
+            sherpa_logger.warning(f"警告: 线程未能在{timeout_ms}毫秒内停止")
+            return False
+        except RuntimeError:
+            # 线程对象已在结束后被删除
+            return True
+
+    @pyqtSlot(str, str)
+    def _on_final_result(self, final_text: str, last_partial: str) -> None:
+        """
+        补全并发送最终识别结果（工作线程结束时由 final_result 信号在界面线程中调用）
 
-        # 以下代码保留但不会执行
-        start_time = time.time()
-        last_progress_update = time.time()
+        队列连接按发送顺序投递，此时工作线程之前发出的完整结果已经显示在字幕窗口中；
+        FinalResult 为空时，用最后一个部分结果在完整结果中查找匹配的句子
 
+        Args:
+            final_text: FinalResult 解析出的最终文本，没有时为空字符串
+            last_partial: 最后一个部分结果，没有时为空字符串
+        """
         try:
-            # 获取音频设备
-            with sc.get_microphone(id=str(self.current_device.id), include_loopback=True).recorder(samplerate=self.sample_rate) as mic:
-                # 发送状态信号
-                self.signals.status_updated.emit(f"正在从 {self.current_device.name} 捕获音频...")
-
-                # 循环捕获音频
-                while self.is_capturing:
-                    # 更新进度条显示转录时长
-                    current_time = time.time()
-                    if current_time - last_progress_update >= 0.5:  # 每0.5秒更新一次
-                        elapsed_seconds = current_time - start_time
-                        minutes = int(elapsed_seconds // 60)
-                        seconds = int(elapsed_seconds % 60)
-                        time_str = f"转录时长: {minutes:02d}:{seconds:02d}"
-                        self.signals.progress_updated.emit(50, time_str)  # 使用固定的50%进度
-                        last_progress_update = current_time
-
-                    # 捕获音频数据
-                    data = mic.record(numframes=self.buffer_size)
-
-                    # 转换为单声道
-                    if data.shape[1] > 1:
-                        data = np.mean(data, axis=1)
-
-                    # 处理音频数据
-                    try:
-                        # 检查数据是否有效
-                        if np.max(np.abs(data)) < 0.01:
-                            print("DEBUG: 音频数据几乎是静音，跳过")
-                            continue
+            text = final_text
+            if not text and last_partial:
+                text = last_partial
+                sherpa_logger.info(f"使用的最后一个部分结果原始值: {text}")
 
-                        # 导入 Sherpa-ONNX 日志工具
-                        try:
-                            from src.utils.sherpa_logger import sherpa_logger
-                        except ImportError:
-                            # 如果导入失败，创建一个简单的日志记录器
-                            class DummyLogger:
-                                def debug(self, msg): print(f"DEBUG: {msg}")
-                                def info(self, msg): print(f"INFO: {msg}")
-                                def warning(self, msg): print(f"WARNING: {msg}")
-                                def error(self, msg): print(f"ERROR: {msg}")
-                            sherpa_logger = DummyLogger()
-
-                        # 检查当前引擎类型
-                        engine_type = getattr(recognizer, 'engine_type', None)
-                        if engine_type and engine_type.startswith('sherpa'):
-                            # 对于 Sherpa-ONNX 模型，直接传递 numpy 数组
-                            sherpa_logger.debug(f"使用 Sherpa-ONNX 模型，直接传递 numpy 数组")
-                            sherpa_logger.debug(f"音频数据类型: {type(data)}, 形状: {data.shape}, 最大值: {np.max(np.abs(data))}")
-                            accept_result = recognizer.AcceptWaveform(data)
-                        else:
-                            # 对于 Vosk 模型，转换为 16 位整数字节
-                            data_bytes = (data * 32767).astype(np.int16).tobytes()
-                            print(f"DEBUG: 处理音频数据，类型: {type(data_bytes)}, 长度: {len(data_bytes)}")
-                            accept_result = recognizer.AcceptWaveform(data_bytes)
-                        sherpa_logger.debug(f"AcceptWaveform 结果: {accept_result}")
+                # 部分结果可能因停止捕获而被截断，尝试从已在UI中显示的完整结果中找到匹配的句子
+                try:
+                    from src.ui.main_window import MainWindow
+                    subtitle_widget = getattr(getattr(MainWindow, 'instance', None), 'subtitle_widget', None)
+                    transcript_text = getattr(subtitle_widget, 'transcript_text', None)
+                    if transcript_text:
+                        text = _resolve_final_text(text, transcript_text)
+                except Exception as e:
+                    sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
 
-                        if accept_result:
-                            # 获取完整结果
-                            result = recognizer.Result()
-                            print(f"完整结果: {result}, 类型: {type(result)}, 引擎类型: {engine_type}")
-                            sherpa_logger.info(f"完整结果: {result}, 类型: {type(result)}, 引擎类型: {engine_type}")
-
-                            # 直接使用结果文本（针对 Sherpa-ONNX 模型）
-                            if isinstance(result, str) and not result.startswith('{'):
-                                # 如果是纯文本字符串（不是 JSON），直接使用
-                                text = result.strip()
-                                print(f"直接使用文本结果: {text}")
-                                sherpa_logger.info(f"直接使用文本结果: {text}")
-                            else:
-                                # 尝试解析 JSON 或其他格式
-                                try:
-                                    if isinstance(result, str):
-                                        result_json = json.loads(result)
-                                    elif hasattr(result, 'text'):
-                                        result_json = {"text": result.text}
-                                    elif hasattr(result, '__str__'):
-                                        result_json = {"text": str(result)}
-                                    else:
-                                        result_json = {"text": "无法解析的结果"}
-
-                                    print(f"解析后的结果: {result_json}")
-                                    sherpa_logger.info(f"解析后的结果: {result_json}")
-
-                                    # 提取文本
-                                    if 'text' in result_json and result_json['text'].strip():
-                                        text = result_json['text'].strip()
-                                    else:
-                                        print(f"结果中没有文本或文本为空")
-                                        sherpa_logger.warning(f"结果中没有文本或文本为空")
-                                        continue
-                                except Exception as e:
-                                    print(f"解析结果错误: {e}")
-                                    sherpa_logger.error(f"解析结果错误: {e}")
-                                    import traceback
-                                    error_trace = traceback.format_exc()
-                                    sherpa_logger.error(error_trace)
-                                    print(error_trace)
-                                    # 如果解析失败，尝试直接使用结果
-                                    text = str(result).strip()
-                                    if not text:
-                                        continue
-
-                            # 格式化文本
-                            if text:
-                                if len(text) > 0:
-                                    text = text[0].upper() + text[1:]
-                                if text[-1] not in ['.', '?', '!']:
-                                    text += '.'
-                                print(f"DEBUG: 发送文本: {text}")
-                                self.signals.new_text.emit(text)
-                            else:
-                                print(f"DEBUG: 文本为空，不发送")
-                        else:
-                            # 获取部分结果
-                            partial_result = recognizer.PartialResult()
-                            print(f"部分结果: {partial_result}, 类型: {type(partial_result)}, 引擎类型: {engine_type}")
-                            sherpa_logger.info(f"部分结果: {partial_result}, 类型: {type(partial_result)}, 引擎类型: {engine_type}")
-
-                            # 直接使用结果文本（针对 Sherpa-ONNX 模型）
-                            if isinstance(partial_result, str) and not partial_result.startswith('{'):
-                                # 如果是纯文本字符串（不是 JSON），直接使用
-                                partial_text = partial_result.strip()
-                                print(f"直接使用部分文本结果: {partial_text}")
-                                sherpa_logger.info(f"直接使用部分文本结果: {partial_text}")
-                                if partial_text:
-                                    print(f"发送部分文本: {partial_text}")
-                                    sherpa_logger.info(f"发送部分文本: {partial_text}")
-                                    self.signals.new_text.emit("PARTIAL:" + partial_text)
-                                else:
-                                    print(f"部分文本为空，不发送")
-                                    sherpa_logger.debug(f"部分文本为空，不发送")
-                            else:
-                                # 尝试解析 JSON 或其他格式
-                                try:
-                                    if isinstance(partial_result, str):
-                                        try:
-                                            partial = json.loads(partial_result)
-                                        except json.JSONDecodeError:
-                                            # 如果不是有效的 JSON，直接使用文本
-                                            partial = {"partial": partial_result}
-                                    elif isinstance(partial_result, dict):
-                                        partial = partial_result
-                                    elif hasattr(partial_result, 'partial'):
-                                        partial = {'partial': str(partial_result.partial)}
-                                    else:
-                                        partial = {'partial': str(partial_result)}
-
-                                    print(f"解析后的部分结果: {partial}")
-                                    sherpa_logger.info(f"解析后的部分结果: {partial}")
-
-                                    # 确保partial字段存在且有效
-                                    partial_text = partial.get('partial', '').strip()
-                                    if partial_text:
-                                        print(f"发送部分文本: {partial_text}")
-                                        sherpa_logger.info(f"发送部分文本: {partial_text}")
-                                        self.signals.new_text.emit("PARTIAL:" + partial_text)
-                                    else:
-                                        print(f"部分结果中没有文本或文本为空")
-                                        sherpa_logger.warning(f"部分结果中没有文本或文本为空")
-                                except Exception as e:
-                                    print(f"解析部分结果错误: {e}")
-                                    sherpa_logger.error(f"解析部分结果错误: {e}")
-                                    import traceback
-                                    error_trace = traceback.format_exc()
-                                    sherpa_logger.error(error_trace)
-                                    print(error_trace)
-                                    # 如果解析失败，尝试直接使用结果
-                                    partial_text = str(partial_result).strip()
-                                    if partial_text:
-                                        print(f"发送部分文本: {partial_text}")
-                                        sherpa_logger.info(f"发送部分文本: {partial_text}")
-                                        self.signals.new_text.emit("PARTIAL:" + partial_text)
-                                    else:
-                                        print(f"部分文本为空，不发送")
-                                        sherpa_logger.debug(f"部分文本为空，不发送")
-                    except Exception as e:
-                        error_msg = f"音频处理错误: {str(e)}"
-                        self.signals.error_occurred.emit(error_msg)
-                        print(f"错误: {error_msg}")
-                        sherpa_logger.error(error_msg)
-                        import traceback
-                        error_trace = traceback.format_exc()
-                        sherpa_logger.error(error_trace)
-                        print(error_trace)
+                text = _format_sentence(text)
+                sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
 
+            if text:
+                sherpa_logger.info(f"发送最终文本: {text}")
+                self.signals.new_text.emit(text)
         except Exception as e:
-            error_msg = f"音频捕获错误: {e}"
-            self.signals.error_occurred.emit(error_msg)
-            print(f"错误: {error_msg}")
-            try:
-                from src.utils.sherpa_logger import sherpa_logger
-                sherpa_logger.error(error_msg)
-                import traceback
-                error_trace = traceback.format_exc()
-                sherpa_logger.error(error_trace)
-                print(error_trace)
-            except ImportError:
-                import traceback
-                traceback.print_exc()
-
+            sherpa_logger.error(f"发送最终结果时发生错误: {e}")
+            import traceback
+            sherpa_logger.error(traceback.format_exc())
         finally:
-            # 发送状态信号
-            elapsed_time = time.time() - start_time
-            self.signals.status_updated.emit(f"音频捕获已停止，持续时间: {elapsed_time:.2f}秒")
-
-            # 确保捕获标志被清除
-            self.is_capturing = False
+            self.capture_finished.emit()
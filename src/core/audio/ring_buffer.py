@@ -0,0 +1,93 @@
+"""
+音频环形缓冲区模块
+在采集线程和识别线程之间传递音频块（单生产者单消费者）
+"""
+import threading
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    单生产者单消费者的音频环形缓冲区
+
+    槽位在首次写入时按音频块形状预分配，之后只做原地复制。
+    head 只由生产者修改，tail 只由消费者修改，读写两端无需加锁，
+    Event 仅用于唤醒等待中的消费者。
+    """
+
+    def __init__(self, slots: int = 8):
+        """
+        初始化环形缓冲区
+
+        Args:
+            slots: 槽位数量
+        """
+        self.slots = slots
+        self._ring = None
+        self._head = 0  # 已写入的块数（生产者）
+        self._tail = 0  # 已释放的块数（消费者）
+        self._pending = False  # 消费者是否持有尚未释放的槽位
+        self._event = threading.Event()
+        self.closed = False
+        self.overruns = 0  # 缓冲区满时丢弃的块数
+
+    def put(self, data: np.ndarray) -> bool:
+        """
+        写入一个音频块（生产者调用）
+
+        Args:
+            data: 音频数据
+
+        Returns:
+            bool: 是否写入成功，缓冲区已满时返回 False
+        """
+        if self._head - self._tail >= self.slots:
+            self.overruns += 1
+            return False
+
+        if self._ring is None or self._ring[0].shape != data.shape:
+            # 首次写入（或块形状变化）时按实际形状分配槽位
+            if self._head != self._tail:
+                self.overruns += 1
+                return False
+            self._ring = [np.empty(data.shape, dtype=np.float32) for _ in range(self.slots)]
+
+        np.copyto(self._ring[self._head % self.slots], data)
+        self._head += 1
+        self._event.set()
+        return True
+
+    def get(self, timeout: float = None):
+        """
+        读取下一个音频块（消费者调用）
+
+        返回的数组直接引用内部槽位，在下一次调用 get 之前保持有效。
+
+        Args:
+            timeout: 等待超时时间（秒）
+
+        Returns:
+            np.ndarray: 音频数据，超时或缓冲区已关闭且为空时返回 None
+        """
+        # 释放上一次取出的槽位
+        if self._pending:
+            self._tail += 1
+            self._pending = False
+
+        while self._head == self._tail:
+            if self.closed:
+                return None
+            self._event.clear()
+            # 清除事件后再检查一次，避免错过生产者刚发出的通知
+            if self._head != self._tail:
+                break
+            if not self._event.wait(timeout):
+                return None
+
+        self._pending = True
+        return self._ring[self._tail % self.slots]
+
+    def close(self) -> None:
+        """关闭缓冲区（生产者结束时调用），唤醒等待中的消费者"""
+        self.closed = True
+        self._event.set()
@@ -166,6 +166,12 @@ class MainWindow(QMainWindow):
             else:
                 self.logger.warning("未找到 new_text 信号")
 
+            if hasattr(self.signals, 'partial_result'):
+                self.logger.debug("连接 partial_result 信号")
+                self.signals.partial_result.connect(self.subtitle_widget.update_partial_text)
+            else:
+                self.logger.warning("未找到 partial_result 信号")
+
             if hasattr(self.signals, 'progress_updated'):
                 self.logger.debug("连接 progress_updated 信号")
                 self.signals.progress_updated.connect(self.control_panel.update_progress)
@@ -190,6 +196,10 @@ class MainWindow(QMainWindow):
             else:
                 self.logger.warning("未找到 transcription_finished 信号")
 
+            # 系统音频转录停止后，工作线程发送完最终结果时再保存转录文本
+            self.logger.debug("连接 capture_finished 信号")
+            self.audio_processor.capture_finished.connect(self._on_capture_finished)
+
             # 连接新增的生命周期信号（如果存在）
             if hasattr(self.signals, 'transcription_started'):
                 self.logger.debug("连接 transcription_started 信号")
@@ -567,6 +577,8 @@ class MainWindow(QMainWindow):
 
     # 用于跟踪是否已保存文件
     _has_saved_transcript = False
+    # 系统音频转录停止后，是否等待音频捕获结束再保存文件
+    _save_on_capture_finished = False
 
     @pyqtSlot()
     def _on_stop_clicked(self):
@@ -631,6 +643,22 @@ class MainWindow(QMainWindow):
         # 重新启用相关菜单项
         self.menu_bar.update_menu_state(is_recording=False)
 
+        # 保存转录文本：文件转录已经停止，直接保存；
+        # 系统音频转录在工作线程发送完最终结果后再保存（见 _on_capture_finished），确保包含最后一句
+        if self.is_file_mode and HAS_FILE_TRANSCRIBER and self.file_transcriber:
+            self._save_stopped_transcript()
+        else:
+            MainWindow._save_on_capture_finished = True
+
+    @pyqtSlot()
+    def _on_capture_finished(self):
+        """音频捕获结束处理（工作线程已结束，最终结果已经显示在字幕窗口中）"""
+        if MainWindow._save_on_capture_finished:
+            MainWindow._save_on_capture_finished = False
+            self._save_stopped_transcript()
+
+    def _save_stopped_transcript(self):
+        """停止转录后自动保存转录文本"""
         # 保存转录文本
         try:
             # 直接获取转录文本
@@ -1664,6 +1692,8 @@ class MainWindow(QMainWindow):
                     # 检查audio_processor是否存在
                     if hasattr(self, 'audio_processor') and self.audio_processor:
                         self.audio_processor.stop_capture()
+                        # 窗口关闭前等待工作线程结束，避免线程仍在运行时被销毁
+                        self.audio_processor.wait_for_worker()
                     else:
                         sherpa_logger.warning("audio_processor不存在，跳过停止音频捕获")
                 except Exception as e:
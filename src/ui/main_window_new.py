@@ -103,6 +103,7 @@ class MainWindow(QMainWindow):
         """连接信号"""
         # 连接转录信号
         self.signals.new_text.connect(self.subtitle_widget.update_text)
+        self.signals.partial_result.connect(self.subtitle_widget.update_partial_text)
         self.signals.progress_updated.connect(self.control_panel.update_progress)
         self.signals.status_updated.connect(self.control_panel.update_status)
         self.signals.error_occurred.connect(self._show_error)
@@ -341,8 +342,9 @@ class MainWindow(QMainWindow):
             # 保存窗口状态
             self.save_window_state()
 
-            # 停止音频捕获
+            # 停止音频捕获，并等待工作线程结束，避免线程仍在运行时被销毁
             self.audio_processor.stop_capture()
+            self.audio_processor.wait_for_worker()
 
             # 释放COM
             com_handler.uninitialize_com()
@@ -3,7 +3,6 @@
 负责字幕的显示和样式管理
 """
 import difflib
-import traceback
 from PyQt5.QtWidgets import (QLabel, QVBoxLayout, QWidget, QGraphicsOpacityEffect,
                              QScrollArea, QSizePolicy)
 from PyQt5.QtGui import QFont
@@ -15,6 +14,18 @@ from src.utils.logger import get_logger
 # 获取日志记录器
 logger = get_logger(__name__)
 
+# 导入 Sherpa-ONNX 日志工具（模块加载时只导入一次）
+try:
+    from src.utils.sherpa_logger import sherpa_logger
+except ImportError:
+    # 如果导入失败，创建一个简单的日志记录器
+    class DummyLogger:
+        def debug(self, msg): print(f"DEBUG: {msg}")
+        def info(self, msg): print(f"INFO: {msg}")
+        def warning(self, msg): print(f"WARNING: {msg}")
+        def error(self, msg): print(f"ERROR: {msg}")
+    sherpa_logger = DummyLogger()
+
 class SubtitleLabel(QLabel):
     """字幕标签类。"""
 
@@ -241,11 +252,21 @@ class SubtitleWidget(QScrollArea):
             return text
 
     @pyqtSlot(str)
-    def update_text(self, text):
+    def update_partial_text(self, text):
+        """更新部分识别结果（连接 partial_result 信号，文本不带PARTIAL:标记）。
+
+        Args:
+            text (str): 部分识别文本
+        """
+        self.update_text(text, partial=True)
+
+    @pyqtSlot(str)
+    def update_text(self, text, partial=False):
         """更新字幕文本。
 
         Args:
-            text (str): 新的字幕文本
+            text (str): 新的字幕文本，以PARTIAL:开头时按部分结果处理
+            partial (bool): text 是否为不带标记的部分结果
         """
         try:
             # 确保转录文本列表存在
@@ -253,10 +274,10 @@ class SubtitleWidget(QScrollArea):
                 self.transcript_text = []
 
             # 处理部分结果标记
-            is_partial = text.startswith("PARTIAL:")
+            is_partial = partial or text.startswith("PARTIAL:")
             if is_partial:
                 # 部分结果只显示，不添加到转录文本列表
-                partial_text = text[8:]  # 移除PARTIAL:标记
+                partial_text = text if partial else text[8:]  # 移除PARTIAL:标记
                 partial_text = self._format_text(partial_text) if partial_text else partial_text
 
                 # 不再需要区分引擎类型，对所有模型使用统一的处理逻辑
@@ -268,18 +289,6 @@ class SubtitleWidget(QScrollArea):
                 if not hasattr(self, 'current_partial_paragraph'):
                     self.current_partial_paragraph = ""
 
-                # 导入 Sherpa-ONNX 日志工具
-                try:
-                    from src.utils.sherpa_logger import sherpa_logger
-                except ImportError:
-                    # 如果导入失败，创建一个简单的日志记录器
-                    class DummyLogger:
-                        def debug(self, msg): print(f"DEBUG: {msg}")
-                        def info(self, msg): print(f"INFO: {msg}")
-                        def warning(self, msg): print(f"WARNING: {msg}")
-                        def error(self, msg): print(f"ERROR: {msg}")
-                    sherpa_logger = DummyLogger()
-
                 # 检查是否与最后一个完整结果相似
                 if self.transcript_text and self._is_similar(partial_text, self.transcript_text[-1]):
                     sherpa_logger.debug(f"部分结果与最后一个完整结果相似，不更新: {partial_text}")
@@ -330,7 +339,6 @@ class SubtitleWidget(QScrollArea):
                             sherpa_logger.debug(f"保存最新部分结果到AudioWorker: {self.current_partial_paragraph}")
                 except Exception as e:
                     sherpa_logger.error(f"保存最新部分结果错误: {e}")
-                    import traceback
                     sherpa_logger.error(traceback.format_exc())
 
                 # 显示最近的完整结果加上当前的部分段落
@@ -346,24 +354,15 @@ class SubtitleWidget(QScrollArea):
                 # 更新字幕标签
                 print(f"[DEBUG] 更新部分结果: {self.current_partial_paragraph}")
                 print(f"[DEBUG] 显示文本列表: {display_text}")
-                try:
-                    # 导入 Sherpa-ONNX 日志工具
-                    from src.utils.sherpa_logger import sherpa_logger
-                    sherpa_logger.info(f"更新部分结果: {self.current_partial_paragraph}")
-                    sherpa_logger.debug(f"显示文本列表: {display_text}")
-                except ImportError:
-                    pass
+                sherpa_logger.info(f"更新部分结果: {self.current_partial_paragraph}")
+                sherpa_logger.debug(f"显示文本列表: {display_text}")
 
                 # 设置字幕文本
                 try:
                     self.subtitle_label.setText('\n'.join(display_text))
                 except Exception as e:
                     print(f"设置字幕文本错误: {e}")
-                    try:
-                        from src.utils.sherpa_logger import sherpa_logger
-                        sherpa_logger.error(f"设置字幕文本错误: {e}")
-                    except ImportError:
-                        pass
+                    sherpa_logger.error(f"设置字幕文本错误: {e}")
 
                 # 记录部分结果到历史记录
                 self.partial_results_history.append(self.current_partial_paragraph)
@@ -375,18 +374,6 @@ class SubtitleWidget(QScrollArea):
                 # 但为了保持一致性，我们仍然调用_format_text方法
                 text = self._format_text(text)
 
-                # 导入 Sherpa-ONNX 日志工具
-                try:
-                    from src.utils.sherpa_logger import sherpa_logger
-                except ImportError:
-                    # 如果导入失败，创建一个简单的日志记录器
-                    class DummyLogger:
-                        def debug(self, msg): print(f"DEBUG: {msg}")
-                        def info(self, msg): print(f"INFO: {msg}")
-                        def warning(self, msg): print(f"WARNING: {msg}")
-                        def error(self, msg): print(f"ERROR: {msg}")
-                    sherpa_logger = DummyLogger()
-
                 # 检查是否与最后一个结果相同或相似
                 if self.transcript_text and (text == self.transcript_text[-1] or self._is_similar(text, self.transcript_text[-1])):
                     # 如果是重复或非常相似的文本，不添加到列表
@@ -450,7 +437,6 @@ class SubtitleWidget(QScrollArea):
                     error_msg = f"设置完整结果文本错误: {e}"
                     print(error_msg)
                     sherpa_logger.error(error_msg)
-                    import traceback
                     error_trace = traceback.format_exc()
                     sherpa_logger.error(error_trace)
                     print(error_trace)
@@ -461,16 +447,10 @@ class SubtitleWidget(QScrollArea):
         except Exception as e:
             error_msg = f"更新字幕错误: {e}"
             print(error_msg)
-            try:
-                from src.utils.sherpa_logger import sherpa_logger
-                sherpa_logger.error(error_msg)
-                import traceback
-                error_trace = traceback.format_exc()
-                sherpa_logger.error(error_trace)
-                print(error_trace)
-            except ImportError:
-                import traceback
-                traceback.print_exc()
+            error_trace = traceback.format_exc()
+            sherpa_logger.error(error_msg)
+            sherpa_logger.error(error_trace)
+            print(error_trace)
 
     def _scroll_to_bottom(self):
         """滚动到底部。"""
@@ -483,7 +463,6 @@ class SubtitleWidget(QScrollArea):
                 QTimer.singleShot(50, lambda: scroll_bar.setValue(scroll_bar.maximum()))
         except Exception as e:
             print(f"滚动到底部错误: {e}")
-            import traceback
             print(traceback.format_exc())
 
     def set_font_size(self, size_key):
@@ -594,50 +573,41 @@ class SubtitleWidget(QScrollArea):
             str: 匹配的完整句子，如果没有找到则返回None
         """
         try:
-            # 导入日志工具
-            try:
-                from src.utils.sherpa_logger import sherpa_logger
-            except ImportError:
-                # 如果导入失败，创建一个简单的日志记录器
-                class DummyLogger:
-                    def debug(self, msg): print(f"DEBUG: {msg}")
-                    def info(self, msg): print(f"INFO: {msg}")
-                    def warning(self, msg): print(f"WARNING: {msg}")
-                    def error(self, msg): print(f"ERROR: {msg}")
-                sherpa_logger = DummyLogger()
-
             if not text:
                 return None
 
             # 打印完整的transcript_text列表，便于调试
             sherpa_logger.info(f"查找匹配的完整句子，当前完整文本列表: {self.transcript_text}")
 
+            # 去掉末尾"and"后的文本只计算一次
+            # 注意：rstrip(" and") 去除的是字符集合而不是后缀（"hand" 会变成 "h"），这里按后缀切片
+            ends_with_and = text.endswith(" and")
+            text_no_and = text[:-4] if ends_with_and else text
+
             # 首先检查是否有以"and"结尾的部分结果
-            if " and " in text or text.endswith(" and"):
+            if ends_with_and or " and " in text:
                 sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
                 # 特殊处理以"and"结尾的情况
                 for complete_text in reversed(self.transcript_text):
                     # 检查是否有包含相同前缀但更完整的句子
-                    if complete_text.startswith(text.rstrip(" and")) and "and " in complete_text:
+                    if complete_text.startswith(text_no_and) and "and " in complete_text:
                         sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {complete_text}")
                         return complete_text
 
             # 如果没有找到匹配，继续使用常规匹配逻辑
-            if text.endswith(" and"):
+            if ends_with_and:
                 # 查找最近的完整结果中是否包含当前部分结果
                 for complete_text in reversed(self.transcript_text):
                     # 检查部分结果是否是完整结果的前缀（去掉末尾的"and"）
-                    prefix = text.rstrip(" and")
-                    if prefix and complete_text.startswith(prefix):
+                    if text_no_and and complete_text.startswith(text_no_and):
                         sherpa_logger.info(f"找到匹配的完整结果(前缀匹配-去除and): {complete_text}")
                         return complete_text
 
             # 如果仍然没有找到匹配，使用常规匹配逻辑
-            if text.endswith(" and"):
+            if ends_with_and:
                 for complete_text in reversed(self.transcript_text):
                     # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中
-                    prefix = text.rstrip(" and")
-                    if prefix and prefix in complete_text:
+                    if text_no_and and text_no_and in complete_text:
                         sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {complete_text}")
                         return complete_text
 
@@ -665,9 +635,9 @@ class SubtitleWidget(QScrollArea):
                         return complete_text
 
                     # 如果部分结果以"and"结尾，特殊处理
-                    if text.endswith(" and"):
+                    if ends_with_and:
                         # 计算去掉"and"后的相似度
-                        partial_words_no_and = text.rstrip(" and").split()
+                        partial_words_no_and = text_no_and.split()
                         if partial_words_no_and:
                             common_words_no_and = set(partial_words_no_and) & set(complete_words)
                             if len(common_words_no_and) >= 0.8 * len(partial_words_no_and):
@@ -679,7 +649,6 @@ class SubtitleWidget(QScrollArea):
             return None
         except Exception as e:
             print(f"查找匹配的完整句子错误: {e}")
-            import traceback
             print(traceback.format_exc())
             return None
 
@@ -694,18 +663,6 @@ class SubtitleWidget(QScrollArea):
             bool: 如果相似度超过阈值返回True
         """
         try:
-            # 导入日志工具
-            try:
-                from src.utils.sherpa_logger import sherpa_logger
-            except ImportError:
-                # 如果导入失败，创建一个简单的日志记录器
-                class DummyLogger:
-                    def debug(self, msg): print(f"DEBUG: {msg}")
-                    def info(self, msg): print(f"INFO: {msg}")
-                    def warning(self, msg): print(f"WARNING: {msg}")
-                    def error(self, msg): print(f"ERROR: {msg}")
-                sherpa_logger = DummyLogger()
-
             if not text1 or not text2:
                 return False
 
@@ -739,7 +696,6 @@ class SubtitleWidget(QScrollArea):
             return False
         except Exception as e:
             print(f"相似度检测错误: {e}")
-            import traceback
             print(traceback.format_exc())
             # 出错时返回False，避免误判
             return False
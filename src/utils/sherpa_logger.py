@@ -64,6 +64,20 @@ class SherpaLogger:
         """
         return self.log_file
 
+    def isEnabledFor(self, level: int) -> bool:
+        """
+        检查指定级别的日志是否会被记录
+
+        用于在热点路径中跳过不会输出的调试消息的格式化
+
+        Args:
+            level: 日志级别
+
+        Returns:
+            bool: 是否会被记录
+        """
+        return bool(self.logger) and self.logger.isEnabledFor(level)
+
     def debug(self, message: str) -> None:
         """
         记录调试日志
@@ -0,0 +1,28 @@
+"""
+Sherpa-ONNX ASR 引擎单元测试
+测试识别结果的后处理
+"""
+import unittest
+from unittest.mock import patch
+
+from src.core.asr.sherpa_engine import _mark_sentence_boundaries
+
+
+class TestMarkSentenceBoundaries(unittest.TestCase):
+    """_mark_sentence_boundaries 函数的测试用例"""
+
+    @patch('src.core.asr.sherpa_engine._CAMEL_SPLIT')
+    def test_skip_regex_without_boundary(self, mock_split):
+        """测试没有句子边界时跳过正则替换"""
+        for text in ("HELLO WORLD", "hello world", "Hello world"):
+            self.assertEqual(_mark_sentence_boundaries(text), text)
+        mock_split.sub.assert_not_called()
+
+    def test_insert_period_at_boundary(self):
+        """测试在小写字母或数字后紧跟大写字母的位置插入句号"""
+        self.assertEqual(_mark_sentence_boundaries("helloWorld"), "hello. World")
+        self.assertEqual(_mark_sentence_boundaries("room 101Next"), "room 101. Next")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -37,10 +37,27 @@ class TestVoskASR(unittest.TestCase):
         mock_exists.assert_called_once_with(self.model_path)
         mock_model.assert_called_once_with(self.model_path)
         mock_recognizer.assert_called_once_with(mock_model_instance, self.asr.sample_rate)
-        mock_recognizer_instance.SetWords.assert_called_once_with(True)
+        mock_recognizer_instance.SetWords.assert_called_once_with(False)
         self.assertEqual(self.asr.model, mock_model_instance)
         self.assertEqual(self.asr.recognizer, mock_recognizer_instance)
 
+    @patch('os.path.exists')
+    @patch('src.core.asr.vosk_engine.Model')
+    @patch('src.core.asr.vosk_engine.KaldiRecognizer')
+    def test_setup_with_words(self, mock_recognizer, mock_model, mock_exists):
+        """测试显式开启逐词输出"""
+        # 设置模拟对象
+        mock_exists.return_value = True
+        mock_recognizer_instance = MagicMock()
+        mock_recognizer.return_value = mock_recognizer_instance
+
+        # 调用方法
+        asr = VoskASR(self.model_path, want_words=True)
+
+        # 验证结果
+        self.assertIs(asr.recognizer, mock_recognizer_instance)
+        mock_recognizer_instance.SetWords.assert_called_once_with(True)
+
     @patch('os.path.exists')
     def test_setup_model_not_found(self, mock_exists):
         """测试模型路径不存在的情况"""
@@ -103,6 +120,20 @@ class TestVoskASR(unittest.TestCase):
         self.asr.recognizer.AcceptWaveform.assert_called_once()
         self.asr.recognizer.Result.assert_called_once()
 
+    def test_transcribe_saturates_out_of_range_samples(self):
+        """测试超出范围的浮点样本被饱和截断而不是回绕"""
+        self.asr.recognizer = MagicMock()
+        self.asr.recognizer.AcceptWaveform.return_value = False
+        self.asr.recognizer.PartialResult.return_value = json.dumps({"partial": ""})
+
+        self.asr.transcribe(np.array([1.5, -1.5, 0.5], dtype=np.float32))
+
+        data = self.asr.recognizer.AcceptWaveform.call_args[0][0]
+        pcm = np.frombuffer(data, dtype=np.int16)
+        self.assertEqual(pcm[0], 32767)
+        self.assertEqual(pcm[1], -32768)
+        self.assertEqual(pcm[2], 16383)
+
     def test_transcribe_with_bytes(self):
         """测试使用字节数据转录"""
         # 设置模拟识别器
@@ -6,9 +6,12 @@ import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
 
-from src.core.audio.audio_processor import AudioProcessor, AudioDevice
+from src.core.audio.audio_processor import (AudioProcessor, AudioWorker, AudioDevice, _clear_device_cache,
+                                            _DEVICE_CACHE_TTL, _capitalize_first, _format_sentence,
+                                            _resolve_final_text)
 from src.core.signals import TranscriptionSignals
 
+
 class TestAudioDevice(unittest.TestCase):
     """AudioDevice类的测试用例"""
 
@@ -18,12 +21,50 @@ class TestAudioDevice(unittest.TestCase):
         self.assertEqual(device.id, "test_id")
         self.assertEqual(device.name, "Test Device")
         self.assertTrue(device.is_input)
+        self.assertFalse(device.is_loopback)
+
+    def test_needs_loopback(self):
+        """测试是否需要回环模式"""
+        self.assertFalse(AudioDevice("mic", "Mic", True).needs_loopback)
+        self.assertTrue(AudioDevice("spk", "Speaker", False).needs_loopback)
+        self.assertTrue(AudioDevice("spk", "Speaker loopback", True, True).needs_loopback)
 
     def test_str(self):
         """测试字符串表示"""
         device = AudioDevice("test_id", "Test Device")
         self.assertEqual(str(device), "Test Device (test_id)")
 
+
+class TestTextFormatting(unittest.TestCase):
+    """识别文本格式化函数的测试用例"""
+
+    def test_capitalize_first(self):
+        """测试首字母大写"""
+        self.assertEqual(_capitalize_first("hello world"), "Hello world")
+        self.assertEqual(_capitalize_first("Hello"), "Hello")
+        self.assertEqual(_capitalize_first("élan"), "Élan")
+        self.assertEqual(_capitalize_first("你好"), "你好")
+        self.assertEqual(_capitalize_first(""), "")
+
+    def test_format_sentence(self):
+        """测试格式化为完整句子"""
+        self.assertEqual(_format_sentence("hello world"), "Hello world.")
+        self.assertEqual(_format_sentence("is it?"), "Is it?")
+        self.assertEqual(_format_sentence("Done."), "Done.")
+
+    def test_resolve_final_text(self):
+        """测试用已显示的完整结果补全最后一个部分结果"""
+        transcript = ["First sentence.", "I went home and then slept."]
+        self.assertEqual(_resolve_final_text("I went home and", transcript), "I went home and then slept.")
+        self.assertEqual(_resolve_final_text("First", transcript), "First sentence.")
+        self.assertEqual(_resolve_final_text("unrelated", transcript), "unrelated")
+
+    def test_resolve_final_text_trailing_and(self):
+        """测试只去掉末尾的"and"后缀，而不是按字符集合去除"""
+        transcript = ["Raise your hat and coat."]
+        self.assertEqual(_resolve_final_text("Raise your hand and", transcript), "Raise your hand and")
+
+
 class TestAudioProcessor(unittest.TestCase):
     """AudioProcessor类的测试用例"""
 
@@ -35,6 +76,14 @@ class TestAudioProcessor(unittest.TestCase):
         # 创建AudioProcessor实例
         self.processor = AudioProcessor(self.signals)
 
+        # 清除设备枚举缓存，避免测试之间相互影响
+        _clear_device_cache()
+
+    def tearDown(self):
+        """每个测试方法执行后停止并等待工作线程，避免线程在测试之间泄漏"""
+        self.processor.stop_capture()
+        self.assertTrue(self.processor.wait_for_worker(5000))
+
     @patch('src.core.audio.audio_processor.sc')
     def test_get_audio_devices(self, mock_sc):
         """测试获取音频设备列表"""
@@ -46,6 +95,7 @@ class TestAudioProcessor(unittest.TestCase):
         mock_mic = MagicMock()
         mock_mic.id = "mic_id"
         mock_mic.name = "Test Microphone"
+        mock_mic.isloopback = False
         
         # 设置模拟的soundcard模块返回值
         mock_sc.all_speakers.return_value = [mock_speaker]
@@ -63,6 +113,39 @@ class TestAudioProcessor(unittest.TestCase):
         self.assertEqual(devices[1].name, "Test Microphone")
         self.assertTrue(devices[1].is_input)
 
+    @patch('src.core.audio.audio_processor.sc')
+    def test_get_audio_devices_cached(self, mock_sc):
+        """测试设备列表缓存"""
+        mock_sc.all_speakers.return_value = []
+        mock_sc.all_microphones.return_value = []
+
+        # 多次获取只枚举一次，且在实例间共享
+        self.processor.get_audio_devices()
+        AudioProcessor(self.signals).get_audio_devices()
+        mock_sc.all_speakers.assert_called_once()
+
+        # 刷新后重新枚举
+        self.processor.refresh_devices()
+        self.assertEqual(mock_sc.all_speakers.call_count, 2)
+
+    @patch('src.core.audio.audio_processor.sc')
+    def test_get_audio_devices_cache_expires(self, mock_sc):
+        """测试设备列表缓存超过有效期后重新枚举"""
+        mock_sc.all_speakers.return_value = []
+        mock_sc.all_microphones.return_value = []
+
+        with patch('src.core.audio.audio_processor.time') as mock_time:
+            mock_time.monotonic.return_value = 1000.0
+            _clear_device_cache()
+            self.processor.get_audio_devices()
+            mock_time.monotonic.return_value = 1000.0 + _DEVICE_CACHE_TTL / 2
+            self.processor.get_audio_devices()
+            mock_sc.all_speakers.assert_called_once()
+
+            mock_time.monotonic.return_value = 1000.0 + _DEVICE_CACHE_TTL + 1
+            self.processor.get_audio_devices()
+            self.assertEqual(mock_sc.all_speakers.call_count, 2)
+
     def test_set_current_device(self):
         """测试设置当前设备"""
         # 创建测试设备
@@ -148,5 +231,37 @@ class TestAudioProcessor(unittest.TestCase):
         self.processor.capture_thread.join.assert_called_once()
         self.assertIsNone(self.processor.capture_thread)
 
+    def test_tune_buffer_size_resets_recognizer(self):
+        """测试自动调整 buffer_size 后重置识别器，预热音频不留在首次转录的流中"""
+        recognizer = MagicMock(engine_type="sherpa_0626_int8")
+        self.processor._tune_buffer_size(recognizer)
+        self.assertEqual(recognizer.AcceptWaveform.call_count, 10)
+        recognizer.reset_stream.assert_called_once()
+
+        # 预热失败时同样重置
+        recognizer = MagicMock(engine_type="sherpa_0626_int8")
+        recognizer.AcceptWaveform.side_effect = RuntimeError("decode failed")
+        self.processor._tune_buffer_size(recognizer)
+        recognizer.reset_stream.assert_called_once()
+
+    def test_on_final_result(self):
+        """测试在界面线程中发送工作线程获取的最终结果，并通知音频捕获结束"""
+        finished = MagicMock()
+        self.processor.capture_finished.connect(finished)
+        self.processor._on_final_result("Done.", "do")
+        self.signals.new_text.emit.assert_called_once_with("Done.")
+        finished.assert_called_once()
+
+    def test_on_final_result_from_partial(self):
+        """测试最终结果为空时使用最后一个部分结果"""
+        self.processor._on_final_result("", "hello there")
+        self.signals.new_text.emit.assert_called_once_with("Hello there.")
+
+    def test_request_stop(self):
+        """测试请求停止工作线程"""
+        worker = AudioWorker(AudioDevice("test_id", "Test Device"), 16000, 320, None)
+        worker.request_stop()
+        self.assertFalse(worker.running)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+"""
+音频环形缓冲区单元测试
+测试AudioRingBuffer类的功能
+"""
+import unittest
+import numpy as np
+
+from src.core.audio.ring_buffer import AudioRingBuffer
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    """AudioRingBuffer类的测试用例"""
+
+    def test_put_get_order(self):
+        """测试按写入顺序读取"""
+        ring = AudioRingBuffer(slots=4)
+        for i in range(3):
+            self.assertTrue(ring.put(np.full((4, 2), i, dtype=np.float32)))
+
+        for i in range(3):
+            data = ring.get(timeout=0)
+            self.assertEqual(data.shape, (4, 2))
+            self.assertTrue(np.all(data == i))
+
+    def test_overrun(self):
+        """测试缓冲区满时丢弃新数据"""
+        ring = AudioRingBuffer(slots=2)
+        self.assertTrue(ring.put(np.zeros(4, dtype=np.float32)))
+        self.assertTrue(ring.put(np.ones(4, dtype=np.float32)))
+        self.assertFalse(ring.put(np.ones(4, dtype=np.float32)))
+        self.assertEqual(ring.overruns, 1)
+
+        # 取出的槽位在下一次 get 时才释放
+        ring.get(timeout=0)
+        self.assertFalse(ring.put(np.ones(4, dtype=np.float32)))
+        ring.get(timeout=0)
+        self.assertTrue(ring.put(np.ones(4, dtype=np.float32)))
+
+    def test_get_timeout(self):
+        """测试空缓冲区超时返回None"""
+        ring = AudioRingBuffer()
+        self.assertIsNone(ring.get(timeout=0.01))
+        self.assertFalse(ring.closed)
+
+    def test_close(self):
+        """测试关闭后读完剩余数据再返回None"""
+        ring = AudioRingBuffer()
+        ring.put(np.zeros(4, dtype=np.float32))
+        ring.close()
+        self.assertIsNotNone(ring.get(timeout=0))
+        self.assertIsNone(ring.get(timeout=0))
+        self.assertTrue(ring.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+"""
+字幕控件单元测试
+测试SubtitleWidget类的错误处理
+"""
+import unittest
+from unittest.mock import patch
+
+from src.ui.widgets.subtitle_widget import SubtitleWidget
+
+
+class _BrokenWidget:
+    """访问完整结果列表时抛出异常的替身，用于触发 update_text 的外层异常处理"""
+
+    @property
+    def transcript_text(self):
+        raise RuntimeError("broken")
+
+
+class TestSubtitleWidget(unittest.TestCase):
+    """SubtitleWidget类的测试用例"""
+
+    @patch('src.ui.widgets.subtitle_widget.sherpa_logger')
+    def test_update_text_outer_handler(self, mock_logger):
+        """测试外层异常处理记录原始错误，而不是在处理过程中再次抛出异常"""
+        SubtitleWidget.update_text(_BrokenWidget(), "hello")
+
+        messages = [call.args[0] for call in mock_logger.error.call_args_list]
+        self.assertIn("更新字幕错误: broken", messages)
+        self.assertTrue(any("RuntimeError: broken" in msg for msg in messages))
+
+
+if __name__ == '__main__':
+    unittest.main()